@@ -0,0 +1,102 @@
+import sys
+import timeit
+import logging
+import subprocess
+
+import PyUtilities.testing
+
+def benchmark(catalogue, *, number=1, repeat=5, label=None):
+	""" Times each function in *catalogue* and logs how they compare to each other.
+	Returns a dictionary of the best time (in seconds) for a single call of each function.
+	See: https://docs.python.org/3/library/timeit.html#timeit.repeat
+
+	catalogue (dict) - What to time; where the key is a label and the value is a function that takes no arguments
+	number (int) - How many times to call each function per measurement
+	repeat (int) - How many measurements to take; the fastest is kept
+	label (str) - What to prefix each logged line with
+
+	Example Input: benchmark({"lorem": lorem, "ipsum": ipsum})
+	Example Input: benchmark({"lorem": lambda: lorem(frame)}, number=100, label="lorem")
+	"""
+
+	answer = {}
+	for (key, myFunction) in catalogue.items():
+		answer[key] = min(timeit.repeat(myFunction, number=number, repeat=repeat)) / number
+
+	if (not answer):
+		return answer
+
+	fastest = min(answer.values()) or 1e-12
+	width = max(len(str(key)) for key in answer.keys())
+	for (key, value) in answer.items():
+		logging.info(f"{f'{label}: ' if label else ''}{str(key):<{width}} {value * 1000:12.4f} ms ({value / fastest:.2f}x)")
+
+	return answer
+
+def benchmark_importTime(module="PyUtilities.datasource.general", *, limit=None, top=10, repeat=3):
+	""" Measures how long it takes to import *module* in a fresh interpreter, using python's own import timer.
+	Logs the slowest imports and returns the best total time (in seconds).
+	See: https://docs.python.org/3/using/cmdline.html#cmdoption-X
+
+	module (str) - Which module to import
+	limit (float) - How many seconds the import is allowed to take
+		- If not None: Raises a ValueError if the import is slower, so this can guard against a new eager import sneaking back in
+	top (int) - How many of the slowest imports to log
+	repeat (int) - How many fresh interpreters to time; the fastest is kept
+
+	Example Input: benchmark_importTime()
+	Example Input: benchmark_importTime("PyUtilities.datasource.postgres", limit=1.5)
+	"""
+
+	def measure():
+		response = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True)
+		if (response.returncode):
+			raise ImportError(f"Could not import '{module}'", response.stderr.strip().splitlines()[-1:])
+
+		# Each line looks like: 'import time:       self [us] |  cumulative | imported package'
+		catalogue = {}
+		for line in response.stderr.splitlines():
+			if (not line.startswith("import time:")):
+				continue
+
+			try:
+				_, cumulative, name = line.split(":", 1)[1].split("|")
+				catalogue[name.strip()] = int(cumulative)
+			except ValueError:
+				continue # The header line
+
+		return catalogue
+
+	#########################
+
+	best = None
+	for _ in range(max(repeat, 1)):
+		catalogue = measure()
+		if ((best is None) or (catalogue.get(module, 0) < best.get(module, 0))):
+			best = catalogue
+
+	total = best.get(module, 0) / 1e6
+	logging.info(f"Importing '{module}' took {total * 1000:.1f} ms")
+	for (name, value) in sorted(((name, value) for (name, value) in best.items() if ("." not in name) and (name != module)), key=lambda item: item[1], reverse=True)[:top]:
+		logging.info(f"    {name:<30} {value / 1000:10.1f} ms")
+
+	if ((limit is not None) and (total > limit)):
+		raise ValueError(f"Importing '{module}' took {total:.3f} seconds, which is more than the limit of {limit} seconds")
+
+	return total
+
+class TestCase(PyUtilities.testing.BaseCase):
+	def test_importTime_staysLazy(self):
+		# These are only loaded once they are used; see: PyUtilities.lazyLoad
+		moduleList = ("psutil", "boto3", "msal", "dropbox", "openpyxl", "orjson", "bs4", "azure", "trello", "netsuite", "pyodbc", "pysftp", "pymsteams", "webflowpy", "PIL", "imagehash")
+
+		response = subprocess.run([sys.executable, "-c", "import sys, PyUtilities.logger, PyUtilities.datasource.general; print(' '.join(sys.modules))"], capture_output=True, text=True)
+		self.assertEqual(response.returncode, 0, response.stderr)
+		self.assertEqual([name for name in moduleList if (name in response.stdout.split())], [])
+
+	def test_importTime_underLimit(self):
+		# Generous, so only a heavy eager import (not a slow machine) trips it
+		self.assertLess(benchmark_importTime("PyUtilities.datasource.general", limit=10, repeat=1), 10)
+
+if (__name__ == "__main__"):
+	PyUtilities.testing.test(TestCase)
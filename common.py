@@ -1,17 +1,26 @@
 """ These functions are generic and not project specific. """
 
+import os
+import sys
 import time
-import uuid
 import types
 import queue
+import pickle
 import typing
+import sqlite3
+import unittest
+import hashlib
 import asyncio
 import inspect
 import itertools
+import functools
+import contextlib
+import threading
 import traceback
 import collections
+import concurrent.futures
 
-from heapdict import heapdict
+from sortedcontainers import SortedList
 
 class Singleton():
 	"""Used to get values correctly.
@@ -180,6 +189,21 @@ def ensure_lastElement(container, default = None):
 
 	return container[-1]
 
+# Whether each type counts as a container when no *elementTypes* are given; filled in as new types are seen
+# Generators are never added, since *iensure_container* evaluates them instead of using this answer
+containerType_catalogue = {
+	type(None): False,
+	str: False,
+	bytes: False,
+	bool: False,
+	int: False,
+	float: False,
+	dict: False,
+	list: True,
+	tuple: True,
+	set: True,
+}
+
 def is_container(item, *, elementTypes=None, elementCriteria=None):
 	"""Returns if the given item is a container or not.
 	Generators are not considered containers.
@@ -219,6 +243,17 @@ def is_container(item, *, elementTypes=None, elementCriteria=None):
 
 	###########################
 
+	if (elementTypes is None):
+		# Most calls are for a handful of types, so skip the abstract type checks for types seen before
+		answer = containerType_catalogue.get(type(item))
+		if (answer is None):
+			answer = is_container(item, elementTypes=())
+			if (not isinstance(item, types.GeneratorType)):
+				containerType_catalogue[type(item)] = answer
+
+		if ((not answer) or (elementCriteria is None) or (not len(item))):
+			return answer
+
 	if (isinstance(item, (str, ELEMENT, typing.Mapping, typing.MutableMapping))):
 		return False
 
@@ -243,6 +278,19 @@ def is_container(item, *, elementTypes=None, elementCriteria=None):
 	return not any(checkType(*required) for required in elementCriteria)
 
 def ensure_container(*args, **kwargs):
+	if ((len(args) == 1) and (not kwargs)):
+		# Skip the generator for types that are known to be (or not be) a container
+		container = args[0]
+		if (container is None):
+			return ()
+
+		answer = containerType_catalogue.get(type(container))
+		if (answer):
+			return tuple(container)
+
+		if (answer is not None):
+			return (container,)
+
 	return tuple(iensure_container(*args, **kwargs))
 
 def iensure_container(container, *, useForNone=None, convertNone=True, is_container_answer=NULL_private,
@@ -394,6 +442,34 @@ def ensure_dict(catalogue, defaultKey=None, *, useAsKey=False, convertContainer=
 
 	return {defaultKey: catalogue}
 
+chunker_catalogue = {
+	list: lambda container, start, stop: tuple(container[start:stop]),
+	tuple: lambda container, start, stop: container[start:stop],
+}
+
+def getChunker(container):
+	""" Returns a function that slices *container* by position without going through it item by item, or None if it cannot be sliced that way.
+	Frames and series give *iloc* views, numpy arrays give array views, and lists give tuples like the generic path does.
+	pandas and numpy are only checked for if something already imported them.
+
+	Example Input: getChunker([1, 2, 3])
+	Example Input: getChunker(frame)
+	"""
+
+	chunker = chunker_catalogue.get(type(container), None)
+	if (chunker is not None):
+		return chunker
+
+	pandas = sys.modules.get("pandas", None)
+	if ((pandas is not None) and isinstance(container, (pandas.DataFrame, pandas.Series))):
+		return lambda container, start, stop: container.iloc[start:stop]
+
+	numpy = sys.modules.get("numpy", None)
+	if ((numpy is not None) and isinstance(container, numpy.ndarray) and container.ndim):
+		return lambda container, start, stop: container[start:stop]
+
+	return None
+
 def yieldChunk(container, chunk_size=1000, *, chunk_offset=0, yield_index=False, yieldGenerator=False, **kwargs):
 	""" Yields a chunk of items from the given container (even if it's a generator).
 	Use: https://stackoverflow.com/questions/8991506/iterate-an-iterator-by-chunks-of-n-in-python/8998040#8998040
@@ -403,8 +479,18 @@ def yieldChunk(container, chunk_size=1000, *, chunk_offset=0, yield_index=False,
 	Example Input: yieldChunk(generator, 2)
 	Example Input: yieldChunk((1,2,3,4,5), 2, chunk_offset=1)
 	Example Input: yieldChunk((1,2,3,4,5), 2, chunk_offset=1, yield_index=True)
+	Example Input: yieldChunk(frame, 50000)
 	"""
 
+	chunker = None if (kwargs) else getChunker(container)
+	if (chunker is not None):
+		for (i, start) in enumerate(range(chunk_offset * chunk_size, len(container), chunk_size), start=chunk_offset):
+			chunk = chunker(container, start, start + chunk_size)
+			if (yieldGenerator):
+				chunk = iter(chunk)
+
+			yield (i, chunk) if (yield_index) else chunk
+		return
 
 	if (not isinstance(container, types.GeneratorType)):
 		container = iensure_container(container, **kwargs)
@@ -448,11 +534,225 @@ def consumeIterator(generator, n=None):
 
 	return next(itertools.islice(generator, n-1, n), None)
 
-def syncRunAsync(myFunction, *, loop=None):
+def yieldParallel(myFunction, container, *, workers=None, max_inflight=None, use_process=False):
+	""" Yields the answer of *myFunction* for each item in *container*, running them in a pool.
+	Answers come out in the same order as *container*, each one as soon as it and everything before it has finished.
+	See: https://docs.python.org/3/library/concurrent.futures.html
+
+	workers (int) - How many threads or processes to use
+		- If None: Will use the number of CPUs
+	max_inflight (int) - How many items can be submitted but not yet yielded at once
+		- If None: Will use twice *workers*
+	use_process (bool) - If a process pool should be used instead of a thread pool (*myFunction* and the items must be picklable)
+
+	Example Input: yieldParallel(lorem, ("a", "b", "c"))
+	Example Input: yieldParallel(lorem, generator, workers=4, max_inflight=8)
+	Example Input: yieldParallel(lorem, filepathList, use_process=True)
+	"""
+
+	workers = workers or os.cpu_count() or 1
+	max_inflight = max(max_inflight or (workers * 2), 1)
+
+	with (concurrent.futures.ProcessPoolExecutor if use_process else concurrent.futures.ThreadPoolExecutor)(max_workers=workers) as executor:
+		pending = collections.deque()
+		try:
+			for item in container:
+				pending.append(executor.submit(myFunction, item))
+				if (len(pending) >= max_inflight):
+					yield pending.popleft().result()
+
+			while pending:
+				yield pending.popleft().result()
+		finally:
+			for future in pending:
+				future.cancel()
+
+def yieldPipeline(source, *stages, queue_size=4, poll_interval=0.1):
+	""" Yields what comes out of the last stage after passing each item from *source* through *stages*.
+	The source and every stage run in their own threads and are connected by bounded queues, so fetching, transforming, and loading overlap.
+	A stage that is too slow makes the ones before it wait instead of piling up items in memory.
+	If any thread raises an error, everything is stopped and the error is raised here.
+	Closing this generator early stops all threads.
+	Items stay in order if every stage uses one worker.
+
+	source (iterable) - Where the items come from
+	stages (callable or tuple) - What to do to each item, in order
+		- If tuple: (myFunction, workers) to use more than one thread for that stage
+		- If a stage returns None: That item is skipped
+	queue_size (int) - How many items can wait between two stages
+	poll_interval (float) - How many seconds to wait between checks if the pipeline was stopped
+
+	Example Input: yieldPipeline(yield_frame(data), lorem)
+	Example Input: yieldPipeline(urlList, (download, 4), parse, queue_size=2)
+	"""
+
+	def put(_queue, item):
+		while (not stop.is_set()):
+			try:
+				_queue.put(item, timeout=poll_interval)
+				return True
+			except queue.Full:
+				pass
+
+		return False
+
+	def get(_queue):
+		while (not stop.is_set()):
+			try:
+				return _queue.get(timeout=poll_interval)
+			except queue.Empty:
+				pass
+
+		return _done
+
+	def runSource():
+		try:
+			for item in source:
+				if (not put(queueList[0], item)):
+					break
+		except BaseException as error:
+			errorList.append(error)
+			stop.set()
+		finally:
+			if (hasattr(source, "close")):
+				source.close()
+
+		for _ in range(workerList[0]):
+			put(queueList[0], _done)
+
+	def runStage(index, myFunction):
+		try:
+			while True:
+				item = get(queueList[index])
+				if (item is _done):
+					break
+
+				answer = myFunction(item)
+				if ((answer is not None) and (not put(queueList[index + 1], answer))):
+					break
+		except BaseException as error:
+			errorList.append(error)
+			stop.set()
+
+		# The last worker of a stage to finish tells the next stage
+		with lock:
+			remaining[index] -= 1
+			is_last = (remaining[index] == 0)
+
+		if (is_last):
+			for _ in range(workerList[index + 1] if (index + 1 < len(workerList)) else 1):
+				put(queueList[index + 1], _done)
+
+	#########################
+
+	_done = object()
+	stop = threading.Event()
+	lock = threading.Lock()
+	errorList = []
+
+	functionList = []
+	workerList = []
+	for stage in stages:
+		myFunction, workers = stage if isinstance(stage, tuple) else (stage, 1)
+		functionList.append(myFunction)
+		workerList.append(max(workers or 1, 1))
+
+	remaining = list(workerList)
+	queueList = [queue.Queue(maxsize=max(queue_size, 1)) for _ in range(len(functionList) + 1)]
+
+	if (not functionList):
+		workerList.append(1) # The source talks to this generator directly
+
+	threadList = [threading.Thread(target=runSource, daemon=True, name="pipeline_source")]
+	for (index, myFunction) in enumerate(functionList):
+		for number in range(workerList[index]):
+			threadList.append(threading.Thread(target=runStage, args=(index, myFunction), daemon=True, name=f"pipeline_{index}_{number}"))
+
+	for thread in threadList:
+		thread.start()
+
+	try:
+		while True:
+			item = get(queueList[-1])
+			if (item is _done):
+				break
+
+			yield item
+	finally:
+		stop.set()
+		for thread in threadList:
+			thread.join()
+
+	if (errorList):
+		raise errorList[0]
+
+def runPipeline(source, *stages, sink=None, **kwargs):
+	""" Passes each item from *source* through *stages* and then into *sink*, with each step running in its own thread.
+	Returns how many items made it into *sink*.
+	See: *yieldPipeline*
+
+	sink (callable or tuple) - What to do with each finished item
+		- If tuple: (myFunction, workers) to use more than one thread
+
+	Example Input: runPipeline(yield_frame(data), sink=functools.partial(PyUtilities.datasource.postgres.insert, table="lorem"))
+	Example Input: runPipeline(yield_frame(data), lorem, sink=(functools.partial(PyUtilities.datasource.postgres.insert, table="lorem"), 2))
+	"""
+
+	def countSink(myFunction):
+		def _countSink(item):
+			myFunction(item)
+			return True
+
+		return _countSink
+
+	#########################
+
+	if (sink is not None):
+		myFunction, workers = sink if isinstance(sink, tuple) else (sink, 1)
+		stages = (*stages, (countSink(myFunction), workers))
+
+	return sum(1 for _ in yieldPipeline(source, *stages, **kwargs))
+
+asyncLoop_catalogue = {}
+asyncLoop_lock = threading.Lock()
+
+def getAsyncLoop():
+	""" Returns an event loop that keeps running in a background thread, starting it the first time.
+	There is one per process, so a forked process will start its own.
+	See: https://docs.python.org/3/library/asyncio-eventloop.html#asyncio.loop.run_forever
+
+	Example Input: getAsyncLoop()
+	"""
+
+	pid = os.getpid()
+	catalogue = asyncLoop_catalogue.get(pid, None)
+	if (catalogue is not None):
+		return catalogue["loop"]
+
+	with asyncLoop_lock:
+		catalogue = asyncLoop_catalogue.get(pid, None)
+		if (catalogue is None):
+			loop = asyncio.new_event_loop()
+			thread = threading.Thread(target=loop.run_forever, name="PyUtilities_asyncLoop", daemon=True)
+			thread.start()
+
+			catalogue = asyncLoop_catalogue[pid] = {"loop": loop, "thread": thread}
+
+	return catalogue["loop"]
+
+def syncRunAsync(myFunction, *, loop=None, timeout=None):
 	""" Runs an async function as a sync function.
 	Use: https://www.joeltok.com/posts/2021-02-python-async-sync/
+	See: https://docs.python.org/3/library/asyncio-task.html#asyncio.run_coroutine_threadsafe
+
+	myFunction (coroutine) - What to run
+	loop (asyncio.AbstractEventLoop) - Which event loop to run it on until it finishes
+		- If None: Will submit it to the loop from *getAsyncLoop*, so the loop (and anything tied to it) is reused between calls
+	timeout (float) - How many seconds to wait for the answer before raising a TimeoutError
+		- If None: Will wait forever
 
 	Example Input: syncRunAsync(lorem())
+	Example Input: syncRunAsync(lorem(), timeout=30)
 	"""
 
 	async def runFunction():
@@ -460,8 +760,218 @@ def syncRunAsync(myFunction, *, loop=None):
 
 	###################
 
-	loop = loop or asyncio.new_event_loop()
-	return loop.run_until_complete(runFunction())
+	if (loop is not None):
+		return loop.run_until_complete(runFunction())
+
+	loop = getAsyncLoop()
+	if (asyncLoop_catalogue[os.getpid()]["thread"] is threading.current_thread()):
+		if (inspect.iscoroutine(myFunction)):
+			myFunction.close()
+		raise RuntimeError("Cannot use syncRunAsync from inside the background event loop; await the coroutine instead")
+
+	future = asyncio.run_coroutine_threadsafe(runFunction(), loop)
+	try:
+		return future.result(timeout=timeout)
+	except concurrent.futures.TimeoutError:
+		future.cancel()
+		raise
+
+def runManyAsync(myFunctionList, *, limit=None, return_exceptions=False, timeout=None):
+	""" Runs many async functions at the same time from sync code, and returns their answers in the same order.
+	See: https://docs.python.org/3/library/asyncio-task.html#asyncio.gather
+
+	myFunctionList (list) - The coroutines to run
+	limit (int) - How many can run at once
+		- If None: There is no limit
+	return_exceptions (bool) - If errors should be returned in place of their answer instead of raised
+	timeout (float) - How many seconds to wait for all of them
+
+	Example Input: runManyAsync([lorem(1), lorem(2)])
+	Example Input: runManyAsync((lorem(i) for i in range(100)), limit=10)
+	"""
+
+	async def runLimited(semaphore, myFunction):
+		async with semaphore:
+			return await myFunction
+
+	async def runAll():
+		if (limit):
+			semaphore = asyncio.Semaphore(limit)
+			return await asyncio.gather(*(runLimited(semaphore, myFunction) for myFunction in myFunctionList), return_exceptions=return_exceptions)
+
+		return await asyncio.gather(*myFunctionList, return_exceptions=return_exceptions)
+
+	###################
+
+	return syncRunAsync(runAll(), timeout=timeout)
+
+def freezeArgs(item):
+	""" Returns *item* as something hashable, turning dictionaries, lists and sets into tuples.
+	Dictionaries and sets are sorted, so the answer (and its repr) does not depend on the order things were added in.
+
+	Example Input: freezeArgs({"lorem": [1, 2]})
+	"""
+
+	if (isinstance(item, dict)):
+		return (dict, tuple(sorted(((freezeArgs(key), freezeArgs(value)) for (key, value) in item.items()), key=repr)))
+
+	if (isinstance(item, (list, tuple))):
+		return (type(item), tuple(freezeArgs(value) for value in item))
+
+	if (isinstance(item, (set, frozenset))):
+		return (set, tuple(sorted((freezeArgs(value) for value in item), key=repr)))
+
+	return item
+
+def memoize(myFunction=None, *, ttl=None, maxsize=128, path=None, key=None):
+	""" A decorator that remembers what a function returned for the given arguments.
+	Unlike *functools.lru_cache*, entries can expire, arguments can be dictionaries or lists, and answers can be kept on disk to be shared between processes and runs.
+	The decorated function gets *cache_info()* and *cache_clear()* like *functools.lru_cache* does.
+	See: https://docs.python.org/3/library/sqlite3.html
+
+	ttl (float) - How many seconds an answer is good for
+		- If None: Answers do not expire
+	maxsize (int) - How many answers to keep in memory; the least recently used are dropped first
+		- If None: There is no limit
+	path (str) - Where to keep answers on disk as an sqlite file; they are looked for there when they are not in memory
+		- If None: Answers are only kept in memory
+		- Only arguments with the same repr each run (not objects that show their memory address) will be found again in a later run
+		- Answers that cannot be pickled are only kept in memory
+	key (function) - Takes the same arguments as *myFunction* and returns what to remember the answer by
+		- If None: Will use all of the arguments
+		- Use this for methods, so the cache is not tied to (and does not keep alive) *self*
+		- If what it returns cannot be hashed (such as a frame): The function is run every time without remembering anything
+
+	Example Input: memoize(lorem)
+	Example Use: @memoize(ttl=3600)
+	Example Use: @memoize(ttl=86400, path="cache.sqlite", maxsize=None)
+	Example Use: @memoize(key=lambda self, sql, **kwargs: (self.account, sql, kwargs))
+	"""
+
+	def decorator(_myFunction):
+		name = f"{_myFunction.__module__}.{_myFunction.__qualname__}"
+		catalogue = collections.OrderedDict() # {key: (expires, answer)}
+		stats = {"hits": 0, "hits_disk": 0, "misses": 0}
+		lock = threading.Lock()
+
+		def getKey(args, kwargs):
+			if (key is not None):
+				return freezeArgs(key(*args, **kwargs))
+
+			return freezeArgs((args, kwargs))
+
+		def getExpires():
+			return None if (ttl is None) else (time.time() + ttl)
+
+		def remember(_key, expires, answer):
+			with lock:
+				catalogue[_key] = (expires, answer)
+				catalogue.move_to_end(_key)
+				if ((maxsize is not None) and (len(catalogue) > maxsize)):
+					catalogue.popitem(last=False)
+
+		def openDisk():
+			connection = sqlite3.connect(path, timeout=30)
+			connection.execute("CREATE TABLE IF NOT EXISTS memoize (name TEXT, key TEXT, expires REAL, answer BLOB, PRIMARY KEY (name, key))")
+			return connection
+
+		def getDiskKey(_key):
+			return hashlib.sha256(repr(_key).encode()).hexdigest()
+
+		def readDisk(_key):
+			with contextlib.closing(openDisk()) as connection:
+				row = connection.execute("SELECT expires, answer FROM memoize WHERE name = ? AND key = ?", (name, getDiskKey(_key))).fetchone()
+
+			if ((row is None) or ((row[0] is not None) and (row[0] <= time.time()))):
+				return (NULL_private, None)
+
+			return (pickle.loads(row[1]), row[0])
+
+		def writeDisk(_key, expires, answer):
+			try:
+				blob = pickle.dumps(answer)
+			except (pickle.PicklingError, TypeError, AttributeError):
+				return
+
+			with contextlib.closing(openDisk()) as connection:
+				with connection:
+					connection.execute("INSERT OR REPLACE INTO memoize VALUES (?, ?, ?, ?)", (name, getDiskKey(_key), expires, blob))
+
+		def cache_info():
+			""" Returns how often answers were found in memory or on disk, and how many are in memory. """
+
+			with lock:
+				return {**stats, "size": len(catalogue), "maxsize": maxsize, "ttl": ttl}
+
+		def cache_clear(*, disk=False):
+			""" Forgets every remembered answer.
+
+			disk (bool) - If the answers kept on disk should also be forgotten
+			"""
+
+			with lock:
+				catalogue.clear()
+				for _key in stats.keys():
+					stats[_key] = 0
+
+			if (disk and path):
+				with contextlib.closing(openDisk()) as connection:
+					with connection:
+						connection.execute("DELETE FROM memoize WHERE name = ?", (name,))
+
+		@functools.wraps(_myFunction)
+		def wrapper(*args, **kwargs):
+			_key = getKey(args, kwargs)
+
+			try:
+				hash(_key)
+			except TypeError:
+				with lock:
+					stats["misses"] += 1
+				return _myFunction(*args, **kwargs)
+
+			with lock:
+				expires, answer = catalogue.get(_key, (None, NULL_private))
+				if (answer is not NULL_private):
+					if ((expires is None) or (expires > time.time())):
+						catalogue.move_to_end(_key)
+						stats["hits"] += 1
+						return answer
+
+					del catalogue[_key]
+
+			if (path):
+				answer, expires = readDisk(_key)
+				if (answer is not NULL_private):
+					remember(_key, expires, answer)
+					with lock:
+						stats["hits_disk"] += 1
+					return answer
+
+			with lock:
+				stats["misses"] += 1
+
+			answer = _myFunction(*args, **kwargs)
+			expires = getExpires()
+
+			remember(_key, expires, answer)
+			if (path):
+				writeDisk(_key, expires, answer)
+
+			return answer
+
+		##########################
+
+		wrapper.cache_info = cache_info
+		wrapper.cache_clear = cache_clear
+		return wrapper
+
+	###############################
+
+	if (myFunction is not None):
+		return decorator(myFunction)
+
+	return decorator
 
 class PriorityQueue():
 	""" Initially created by ChatGPT.
@@ -547,18 +1057,44 @@ class PriorityQueue():
 			None
 	"""
 
+	class Item():
+		""" What the queue remembers about each label.
+		*key* is what the queue is sorted by: (-priority, tiebreak, token, label); the token is unique, so *label* is never compared.
+		"""
+
+		__slots__ = ("key", "timestamp")
+
+		def __init__(self, key, timestamp):
+			self.key = key
+			self.timestamp = timestamp
+
+		@property
+		def priority(self):
+			return -self.key[0]
+
+		@property
+		def token(self):
+			return self.key[2]
+
 	def __init__(self, limit=None, tiebreak_order=None):
 		""" Initialize a new PriorityQueue instance with an optional limit.
 
 		limit (int, optional) - The maximum number of items allowed in the queue. Default is None.
+		tiebreak_order (list, optional) - Which labels should come first when they have the same priority
 
 		Example Input: PriorityQueue(limit=10)
 		"""
 
 		self.limit = limit if (limit and (limit > 0)) else None
 		self.tiebreak_order = tiebreak_order or []
-		self.queue = heapdict()
+		self.tiebreak_rank = {}
+		for (i, label) in enumerate(self.tiebreak_order):
+			self.tiebreak_rank.setdefault(label, i)
+
+		# See: https://grantjenks.com/docs/sortedcontainers/sortedlist.html
+		self.queue = SortedList()
 		self.items = {}
+		self.sequence = itertools.count()
 
 	def __len__(self):
 		return len(self.queue)
@@ -569,17 +1105,31 @@ class PriorityQueue():
 	def __contains__(self, label):
 		return (label in self.items)
 
-	def isFull(self):
+	def isFull(self, amount=1):
 		""" Returns if the queue is full or not.
 
+		amount (int) - How many items would need to fit
+
 		Example Input: isFull()
+		Example Input: isFull(100)
 		"""
 
-		return ((self.limit is not None) and (len(self.queue) >= self.limit))
+		return ((self.limit is not None) and (len(self.queue) + amount > self.limit))
+
+	def _makeItem(self, label, priority, timestamp):
+		# Negate the priority to ensure higher priorities come first
+		return PriorityQueue.Item((-priority, self.tiebreak_rank.get(label, len(self.tiebreak_order)), next(self.sequence), label), timestamp)
+
+	def _checkToken(self, label, token):
+		item = self.items.get(label)
+		if ((item is None) or (item.key[2] != token)):
+			raise PriorityQueue.InvalidTokenError
+
+		return item
 
 	def add(self, label, priority=0):
 		""" Add a new item to the PriorityQueue with an optional priority.
-		Returns A unique token (str) for the added item.
+		Returns A unique token (int) for the added item.
 
 		label (str) - The label to associate with the new item.
 		priority (int, optional) - The priority of the item. Default is 0.
@@ -593,44 +1143,64 @@ class PriorityQueue():
 		if (label in self.items):
 			raise PriorityQueue.AlreadyInQueueError
 
-		token = str(uuid.uuid4())
-		timestamp = time.time()
+		item = self.items[label] = self._makeItem(label, priority, time.time())
+		self.queue.add(item.key)
 
-		# Apply tiebreak order
-		if label in self.tiebreak_order:
-			tiebreak_priority = self.tiebreak_order.index(label)
-		else:
-			tiebreak_priority = len(self.tiebreak_order)
+		return item.key[2]
 
-		self.queue[label] = (-priority, tiebreak_priority) # Negate the priority to ensure higher priorities come first
-		self.items[label] = {"token": token, "timestamp": timestamp, "priority": priority}
+	def extend(self, catalogue):
+		""" Adds many items to the PriorityQueue at once, sorting them in one go.
+		Nothing is added if any of them cannot be.
+		Returns a list of tokens, in the same order as *catalogue*.
 
-		return token
+		catalogue (dict) - What to add; where the key is the label and the value is its priority
+			- If list: Each item is a label with a priority of 0
+
+		Example Input: extend({"lorem": 2, "ipsum": 0})
+		Example Input: extend(("lorem", "ipsum"))
+		"""
+
+		if (not isinstance(catalogue, dict)):
+			catalogue = dict.fromkeys(catalogue, 0)
+
+		if (self.isFull(len(catalogue))):
+			raise PriorityQueue.FullError
+
+		if (any(label in self.items for label in catalogue.keys())):
+			raise PriorityQueue.AlreadyInQueueError
+
+		timestamp = time.time()
+		itemList = [self._makeItem(label, priority, timestamp) for (label, priority) in catalogue.items()]
+
+		self.items.update((item.key[3], item) for item in itemList)
+		self.queue.update(item.key for item in itemList)
+
+		return [item.key[2] for item in itemList]
 
 	def increase_priority(self, label, token, amount=1):
 		""" Increase the priority of an item in the PriorityQueue.
 
 		label (str) - The label of the item to update.
-		token (str) - The token associated with the item.
+		token (int) - The token associated with the item.
 		amount (int, optional) - The amount to increase the priority by. Default is 1.
 
-		Example Input: increase_priority("lorem", token="some_token", amount=2)
+		Example Input: increase_priority("lorem", token=12, amount=2)
 		"""
 
-		if ((label not in self.items) or (self.items[label]["token"] != token)):
-			raise PriorityQueue.InvalidTokenError
+		item = self._checkToken(label, token)
 
-		self.queue[label] -= amount  # Update the priority in the queue
-		self.items[label]["priority"] += amount  # Update the priority in the items dictionary
+		self.queue.remove(item.key)
+		item.key = (item.key[0] - amount, *item.key[1:])
+		self.queue.add(item.key)
 
 	def decrease_priority(self, label, token, amount=1):
 		""" Decrease the priority of an item in the PriorityQueue.
 
 		label (str) - The label of the item to update.
-		token (str) - The token associated with the item.
+		token (int) - The token associated with the item.
 		amount (int, optional) - The amount to decrease the priority by. Default is 1.
 
-		Example Input: decrease_priority("lorem", token="some_token", amount=2)
+		Example Input: decrease_priority("lorem", token=12, amount=2)
 		"""
 
 		self.increase_priority(label, token, -amount)
@@ -640,15 +1210,14 @@ class PriorityQueue():
 		Returns True if the item was successfully removed.
 
 		label (str) - The label of the item to remove.
-		token (str) - The token associated with the item.
+		token (int) - The token associated with the item.
 
-		Example Input: remove("lorem", token="some_token")
+		Example Input: remove("lorem", token=12)
 		"""
 
-		if ((label not in self.items) or (self.items[label]["token"] != token)):
-			raise PriorityQueue.InvalidTokenError
+		item = self._checkToken(label, token)
 
-		del self.queue[label]
+		self.queue.remove(item.key)
 		del self.items[label]
 
 		return True
@@ -662,10 +1231,11 @@ class PriorityQueue():
 		Example Input: position("lorem")
 		"""
 
-		if (label not in self.items):
+		item = self.items.get(label)
+		if (item is None):
 			return None
 
-		return sorted(self.queue.keys(), key=lambda x: self.queue[x]).index(label)
+		return self.queue.index(item.key)
 
 	def timestamp(self, label):
 		""" Return the timestamp of the specified item in the queue, or None if the item is not in the queue.
@@ -675,11 +1245,11 @@ class PriorityQueue():
 		Example Input: timestamp("lorem")
 		"""
 
-		catalogue = self.items.get(label)
-		if (not catalogue):
+		item = self.items.get(label)
+		if (item is None):
 			return None
 
-		return catalogue["timestamp"]
+		return item.timestamp
 
 	def priority(self, label):
 		""" Return the priority of the specified item in the queue, or None if the item is not in the queue.
@@ -689,11 +1259,11 @@ class PriorityQueue():
 		Example Input: priority("lorem")
 		"""
 
-		catalogue = self.items.get(label)
-		if (not catalogue):
+		item = self.items.get(label)
+		if (item is None):
 			return None
 
-		return catalogue["priority"]
+		return item.priority
 
 	def info(self, label=None):
 		""" Get all the information for an item in the PriorityQueue (except its token).
@@ -707,21 +1277,21 @@ class PriorityQueue():
 		if (label is None):
 			return tuple(self.yield_info())
 
-		catalogue = self.items.get(label)
-		if (not catalogue):
+		item = self.items.get(label)
+		if (item is None):
 			return None
 
-		return {"label": label, "priority": catalogue["priority"], "timestamp": catalogue["timestamp"], "position": self.position(label)}
+		return {"label": label, "priority": item.priority, "timestamp": item.timestamp, "position": self.position(label)}
 
 	def yield_info(self):
 		""" Get the information for all items in the PriorityQueue.
-		Yields dictionaries containing the information for each item in the queue.
+		Yields dictionaries containing the information for each item in the queue, in the order they will come out.
 
 		Example Input: yield_info()
 		"""
 
-		for label in self.queue.keys():
-			yield self.info(label)
+		for (position, key) in enumerate(self.queue):
+			yield {"label": key[3], "priority": -key[0], "timestamp": self.items[key[3]].timestamp, "position": position}
 
 	def next(self):
 		""" Get the next item in the PriorityQueue (removing it from the queue).
@@ -732,14 +1302,50 @@ class PriorityQueue():
 		if not self.queue:
 			return None
 
-		label, _ = self.queue.popitem()
+		label = self.queue.pop(0)[3]
 		del self.items[label]
 
 		return label
 
+	def pop_many(self, amount=None):
+		""" Get the next few items in the PriorityQueue (removing them from the queue).
+		Returns a list of labels in the order they would have come out of *next*.
+
+		amount (int) - How many items to get
+			- If None: Will empty the queue
+
+		Example Input: pop_many(100)
+		"""
+
+		keyList = self.queue[:amount]
+		del self.queue[:amount]
+
+		for key in keyList:
+			del self.items[key[3]]
+
+		return [key[3] for key in keyList]
+
+	def is_ready(self, priority=None):
+		""" Returns if there is a next item, and if its priority is at least *priority*.
+
+		priority (int) - The lowest priority the next item can have
+			- If None: Any priority will do
+
+		Example Input: is_ready()
+		Example Input: is_ready(priority=2)
+		"""
+
+		if (not self.queue):
+			return False
+
+		return (priority is None) or (-self.queue[0][0] >= priority)
+
 	class FullError(Exception):
 		pass
 
+	class EmptyError(Exception):
+		pass
+
 	class AlreadyInQueueError(Exception):
 		pass
 
@@ -779,11 +1385,11 @@ class PriorityQueue():
 		# Verify updated position
 		assert pq.position("banana") == 1
 
-		# Verify the next item in the queue
-		assert pq.next() == "banana"
+		# Verify the next item in the queue (items with the same priority come out in the order they were added)
+		assert pq.next() == "apple"
 
 		# Verify the next item in the queue after removing the previous one
-		assert pq.next() == "apple"
+		assert pq.next() == "banana"
 
 		# Verify removing an item with an incorrect token raises an error
 		try:
@@ -846,6 +1452,503 @@ class PriorityQueue():
 
 
 
+class BlockingPriorityQueue(PriorityQueue):
+	""" A *PriorityQueue* that can be shared between threads.
+	Consumers wait in *get* until an item is ready instead of polling *next*, and producers wait in *put* until there is room.
+	See: https://docs.python.org/3/library/threading.html#condition-objects
+
+	Example Use:
+		myQueue = BlockingPriorityQueue(limit=10)
+
+		# In a worker thread
+		label = myQueue.get(timeout=5)
+
+		# In another thread
+		token = myQueue.put("lorem", priority=1)
+	"""
+
+	def __init__(self, *args, **kwargs):
+		super().__init__(*args, **kwargs)
+		self.condition = threading.Condition()
+
+	def __len__(self):
+		with self.condition:
+			return super().__len__()
+
+	def __bool__(self):
+		with self.condition:
+			return super().__bool__()
+
+	def __contains__(self, label):
+		with self.condition:
+			return super().__contains__(label)
+
+	def isFull(self, amount=1):
+		with self.condition:
+			return super().isFull(amount)
+
+	def add(self, *args, **kwargs):
+		with self.condition:
+			token = super().add(*args, **kwargs)
+			self.condition.notify_all()
+			return token
+
+	def increase_priority(self, *args, **kwargs):
+		with self.condition:
+			super().increase_priority(*args, **kwargs)
+			self.condition.notify_all()
+
+	def remove(self, *args, **kwargs):
+		with self.condition:
+			answer = super().remove(*args, **kwargs)
+			self.condition.notify_all()
+			return answer
+
+	def extend(self, *args, **kwargs):
+		with self.condition:
+			tokenList = super().extend(*args, **kwargs)
+			self.condition.notify_all()
+			return tokenList
+
+	def next(self):
+		with self.condition:
+			label = super().next()
+			self.condition.notify_all()
+			return label
+
+	def pop_many(self, *args, **kwargs):
+		with self.condition:
+			labelList = super().pop_many(*args, **kwargs)
+			self.condition.notify_all()
+			return labelList
+
+	def position(self, label):
+		with self.condition:
+			return super().position(label)
+
+	def info(self, label=None):
+		with self.condition:
+			return super().info(label)
+
+	def yield_info(self):
+		# Copied while locked, so other threads are not kept waiting while the caller loops
+		with self.condition:
+			infoList = tuple(super().yield_info())
+
+		for info in infoList:
+			yield info
+
+	def timestamp(self, label):
+		with self.condition:
+			return super().timestamp(label)
+
+	def priority(self, label):
+		with self.condition:
+			return super().priority(label)
+
+	def is_ready(self, priority=None):
+		with self.condition:
+			return super().is_ready(priority)
+
+	def put(self, label, priority=0, *, timeout=None):
+		""" Adds an item, waiting for there to be room if the queue is full.
+		Returns the token for the added item.
+
+		timeout (float) - How many seconds to wait for room
+			- If None: Will wait forever
+			- If not None: Raises a FullError if there is still no room
+
+		Example Input: put("lorem")
+		Example Input: put("lorem", priority=2, timeout=5)
+		"""
+
+		with self.condition:
+			if (not self.condition.wait_for(lambda: not self.isFull(), timeout=timeout)):
+				raise PriorityQueue.FullError
+
+			return self.add(label, priority=priority)
+
+	def get(self, *, timeout=None, priority=None):
+		""" Returns the next item, waiting for one to be ready if there is not one yet.
+
+		timeout (float) - How many seconds to wait for an item
+			- If None: Will wait forever
+			- If not None: Raises an EmptyError if there is still no item
+		priority (int) - Only take an item with at least this priority; raising an item's priority will wake this up
+
+		Example Input: get()
+		Example Input: get(timeout=5)
+		Example Input: get(priority=2)
+		"""
+
+		with self.condition:
+			if (not self.condition.wait_for(lambda: self.is_ready(priority), timeout=timeout)):
+				raise PriorityQueue.EmptyError
+
+			return self.next()
+
+class AsyncPriorityQueue(PriorityQueue):
+	""" A *PriorityQueue* for coroutines running on the same event loop.
+	Consumers can await *get* instead of polling *next*, and producers can await *put* when the queue is full.
+	See: https://docs.python.org/3/library/asyncio-future.html
+
+	Example Use:
+		myQueue = AsyncPriorityQueue()
+		label = await myQueue.get(timeout=5)
+	"""
+
+	def __init__(self, *args, **kwargs):
+		super().__init__(*args, **kwargs)
+		self.waiters = []
+
+	def _wakeup(self):
+		""" Lets everything waiting in *get* or *put* check the queue again. """
+
+		waiters, self.waiters = self.waiters, []
+		for future in waiters:
+			if (not future.done()):
+				future.set_result(None)
+
+	async def _wait_for(self, myFunction, timeout, error):
+		""" Waits until *myFunction* returns True, or raises *error* after *timeout* seconds.
+		*myFunction* is checked in the caller's own task, so nothing else can run between it passing and the caller acting on it.
+		"""
+
+		loop = asyncio.get_running_loop()
+		deadline = None if (timeout is None) else (loop.time() + timeout)
+
+		while (not myFunction()):
+			future = loop.create_future()
+			self.waiters.append(future)
+
+			try:
+				await asyncio.wait_for(future, timeout=None if (deadline is None) else max(deadline - loop.time(), 0))
+			except asyncio.TimeoutError:
+				raise error
+
+	def add(self, *args, **kwargs):
+		token = super().add(*args, **kwargs)
+		self._wakeup()
+		return token
+
+	def increase_priority(self, *args, **kwargs):
+		super().increase_priority(*args, **kwargs)
+		self._wakeup()
+
+	def remove(self, *args, **kwargs):
+		answer = super().remove(*args, **kwargs)
+		self._wakeup()
+		return answer
+
+	def extend(self, *args, **kwargs):
+		tokenList = super().extend(*args, **kwargs)
+		self._wakeup()
+		return tokenList
+
+	def next(self):
+		label = super().next()
+		self._wakeup()
+		return label
+
+	def pop_many(self, *args, **kwargs):
+		labelList = super().pop_many(*args, **kwargs)
+		self._wakeup()
+		return labelList
+
+	async def put(self, label, priority=0, *, timeout=None):
+		""" Adds an item, waiting for there to be room if the queue is full.
+		Returns the token for the added item.
+
+		timeout (float) - How many seconds to wait for room
+			- If None: Will wait forever
+			- If not None: Raises a FullError if there is still no room
+
+		Example Input: await put("lorem")
+		"""
+
+		await self._wait_for(lambda: not self.isFull(), timeout, PriorityQueue.FullError)
+		return self.add(label, priority=priority)
+
+	async def get(self, *, timeout=None, priority=None):
+		""" Returns the next item, waiting for one to be ready if there is not one yet.
+
+		timeout (float) - How many seconds to wait for an item
+			- If None: Will wait forever
+			- If not None: Raises an EmptyError if there is still no item
+		priority (int) - Only take an item with at least this priority; raising an item's priority will wake this up
+
+		Example Input: await get()
+		Example Input: await get(timeout=5, priority=2)
+		"""
+
+		await self._wait_for(lambda: self.is_ready(priority), timeout, PriorityQueue.EmptyError)
+		return self.next()
+
+def benchmark_container(*, number=10000, **kwargs):
+	""" Compares the fast type lookup in *is_container* and *ensure_container* to the generic path they fall back to.
+	Returns what *PyUtilities.benchmarking.benchmark* returns for each kind of input.
+
+	Example Input: benchmark_container()
+	"""
+
+	import PyUtilities.benchmarking
+
+	class Frame():
+		""" Stands in for a pandas frame, which is iterable but not a container. """
+
+		def __iter__(self):
+			return iter(())
+
+	answer = {}
+	for (label, item) in {"None": None, "str": "lorem", "int": 1, "dict": {"lorem": 1}, "list": [1, 2, 3], "tuple": (1, 2, 3), "iterable": Frame()}.items():
+		answer[label] = PyUtilities.benchmarking.benchmark({
+			"is_container": lambda: is_container(item),
+			"is_container (generic)": lambda: is_container(item, elementTypes=()),
+			"ensure_container": lambda: ensure_container(item),
+			"ensure_container (generic)": lambda: tuple(iensure_container(item)),
+		}, number=number, label=label, **kwargs)
+
+	return answer
+
+def benchmark_priorityQueue(sizes=(1000, 10000, 100000), **kwargs):
+	""" Times filling, ranking in, and listing a *PriorityQueue* at different sizes.
+	The old way of ranking (sorting every key for each call) is timed too, so the two can be compared.
+	Returns what *PyUtilities.benchmarking.benchmark* returns for each size.
+
+	sizes (list) - How many items to fill the queue with for each run
+
+	Example Input: benchmark_priorityQueue()
+	Example Input: benchmark_priorityQueue((1000,), repeat=3)
+	"""
+
+	import random
+	import PyUtilities.benchmarking
+
+	def fill(size):
+		queue = PriorityQueue()
+		for i in range(size):
+			queue.add(i, priority=random.randint(0, 10))
+		return queue
+
+	#########################
+
+	answer = {}
+	for size in sizes:
+		queue = fill(size)
+		label = random.randrange(size)
+
+		answer[size] = PyUtilities.benchmarking.benchmark({
+			"add": lambda: fill(size),
+			"extend": lambda: PriorityQueue().extend({i: random.randint(0, 10) for i in range(size)}),
+			"position": lambda: queue.position(label),
+			"position (sorted)": lambda: sorted(queue.items.keys(), key=lambda x: queue.items[x].key).index(label),
+			"info": lambda: queue.info(),
+		}, label=f"{size} items", **kwargs)
+
+	return answer
+
+class TestCase(unittest.TestCase):
+	# *PyUtilities.testing* imports this module, so its *BaseCase* cannot be used here
+
+	def test_ensure_container_evaluatesGenerators(self):
+		self.assertFalse(is_container(item for item in (1, 2)))
+		self.assertNotIn(types.GeneratorType, containerType_catalogue)
+
+		self.assertEqual(ensure_container(item for item in (1, 2)), (1, 2))
+		self.assertEqual(ensure_container(item for item in ()), ())
+
+	def test_ensure_container_usesCatalogue(self):
+		self.assertEqual(ensure_container([1, 2]), (1, 2))
+		self.assertEqual(ensure_container("lorem"), ("lorem",))
+		self.assertEqual(ensure_container(None), ())
+		self.assertEqual(ensure_container({"lorem": 1}), ({"lorem": 1},))
+
+	def test_yieldPipeline_keepsOrder(self):
+		self.assertEqual(list(yieldPipeline(range(50), lambda item: item * 2, str)), [str(i * 2) for i in range(50)])
+		self.assertEqual(list(yieldPipeline(range(10), lambda item: item if (item % 2) else None)), [1, 3, 5, 7, 9])
+		self.assertEqual(sorted(yieldPipeline(range(50), (lambda item: item + 1, 4))), list(range(1, 51)))
+
+	def test_yieldPipeline_waitsForSlowStages(self):
+		produced = []
+		def source():
+			for i in itertools.count():
+				produced.append(i)
+				yield i
+
+		pipeline = yieldPipeline(source(), lambda item: item, queue_size=1)
+		self.assertEqual(next(pipeline), 0)
+		time.sleep(0.3)
+
+		# Each queue, stage and the source can only hold one item while the consumer waits
+		self.assertLess(len(produced), 8)
+		pipeline.close()
+
+	def test_yieldPipeline_raisesStageError(self):
+		def stage(item):
+			if (item == 5):
+				raise ValueError("lorem")
+			return item
+
+		answer = []
+		with self.assertRaisesRegex(ValueError, "lorem"):
+			for item in yieldPipeline(range(100), stage, queue_size=2):
+				answer.append(item)
+
+		self.assertEqual(answer, list(range(len(answer))))
+		self.assertLessEqual(len(answer), 5)
+
+	def test_BlockingPriorityQueue_getWaitsForProducer(self):
+		myQueue = BlockingPriorityQueue()
+		thread = threading.Timer(0.1, myQueue.put, args=("lorem",))
+		thread.start()
+
+		start = time.perf_counter()
+		self.assertEqual(myQueue.get(timeout=5), "lorem")
+		self.assertGreater(time.perf_counter() - start, 0.05)
+		thread.join()
+
+		with self.assertRaises(PriorityQueue.EmptyError):
+			myQueue.get(timeout=0.05)
+
+	def test_BlockingPriorityQueue_putWaitsForRoom(self):
+		myQueue = BlockingPriorityQueue(limit=1)
+		myQueue.put("lorem")
+
+		thread = threading.Thread(target=myQueue.put, args=("ipsum",), kwargs={"timeout": 5})
+		thread.start()
+		time.sleep(0.1)
+		self.assertTrue(thread.is_alive())
+		self.assertNotIn("ipsum", myQueue)
+
+		self.assertEqual(myQueue.get(timeout=5), "lorem")
+		thread.join(timeout=5)
+		self.assertFalse(thread.is_alive())
+		self.assertEqual(myQueue.get(timeout=5), "ipsum")
+
+		with self.assertRaises(PriorityQueue.FullError):
+			myQueue.put("dolor")
+			myQueue.put("sit", timeout=0.05)
+
+	def test_BlockingPriorityQueue_getWaitsForPriority(self):
+		myQueue = BlockingPriorityQueue()
+		token = myQueue.put("lorem", priority=0)
+
+		thread = threading.Timer(0.1, myQueue.increase_priority, args=("lorem", token, 2))
+		thread.start()
+		self.assertEqual(myQueue.get(timeout=5, priority=2), "lorem")
+		thread.join()
+
+	def test_AsyncPriorityQueue_getWaitsForProducer(self):
+		async def produce(myQueue):
+			await asyncio.sleep(0.1)
+			await myQueue.put("lorem")
+			await myQueue.put("ipsum")
+
+		async def run():
+			myQueue = AsyncPriorityQueue(limit=1)
+			task = asyncio.create_task(produce(myQueue))
+
+			answer = [await myQueue.get(timeout=5)]
+			answer.append(await myQueue.get(timeout=5))
+			await task
+
+			with self.assertRaises(PriorityQueue.EmptyError):
+				await myQueue.get(timeout=0.05)
+
+			return answer
+
+		self.assertEqual(asyncio.run(run()), ["lorem", "ipsum"])
+
+	def test_memoize_remembersAnswers(self):
+		callList = []
+
+		@memoize(maxsize=2)
+		def lorem(value, *, option=None):
+			callList.append(value)
+			return value * 2
+
+		self.assertEqual(lorem(1), 2)
+		self.assertEqual(lorem(1), 2)
+		self.assertEqual(callList, [1])
+
+		# Different arguments are a different answer
+		self.assertEqual(lorem(1, option={"ipsum": [1, 2]}), 2)
+		self.assertEqual(lorem(1, option={"ipsum": [1, 2]}), 2)
+		self.assertEqual(lorem(1, option={"ipsum": [1, 3]}), 2)
+		self.assertEqual(callList, [1, 1, 1])
+		self.assertEqual(lorem.cache_info()["hits"], 2)
+
+		# Only the 2 most recent are kept
+		lorem(1)
+		self.assertEqual(callList, [1, 1, 1, 1])
+
+		lorem.cache_clear()
+		lorem(1, option={"ipsum": [1, 3]})
+		self.assertEqual(len(callList), 5)
+
+	def test_memoize_expires(self):
+		callList = []
+
+		@memoize(ttl=0.05)
+		def lorem(value):
+			callList.append(value)
+			return value
+
+		lorem(1)
+		lorem(1)
+		time.sleep(0.1)
+		lorem(1)
+		self.assertEqual(callList, [1, 1])
+
+	def test_memoize_sharesAnswersOnDisk(self):
+		import tempfile
+
+		callList = []
+		def makeFunction(path):
+			@memoize(path=path)
+			def lorem(value):
+				callList.append(value)
+				return {"value": value} if (value != "lock") else threading.Lock()
+			return lorem
+
+		with tempfile.TemporaryDirectory() as folder:
+			path = os.path.join(folder, "cache.sqlite")
+			makeFunction(path)([1, 2])
+			makeFunction(path)("lock")
+
+			# A new function (as if this were a new run) finds the answer on disk
+			lorem = makeFunction(path)
+			self.assertEqual(lorem([1, 2]), {"value": [1, 2]})
+			self.assertEqual(lorem.cache_info()["hits_disk"], 1)
+			self.assertEqual(callList, [[1, 2], "lock"])
+
+			# Answers that cannot be pickled are still kept in memory
+			self.assertIs(lorem("lock"), lorem("lock"))
+			self.assertEqual(callList, [[1, 2], "lock", "lock"])
+
+			lorem.cache_clear(disk=True)
+			makeFunction(path)([1, 2])
+			self.assertEqual(len(callList), 4)
+
+	def test_memoize_unhashableArguments(self):
+		callList = []
+
+		@memoize
+		def lorem(value):
+			callList.append(value)
+			return len(value)
+
+		self.assertEqual(lorem(bytearray(b"ab")), 2)
+		self.assertEqual(lorem(bytearray(b"ab")), 2)
+		self.assertEqual(len(callList), 2)
+		self.assertEqual(lorem.cache_info()["size"], 0)
+
+		# Arguments that cannot be pickled are fine, since only their repr is stored
+		lock = threading.Lock()
+		self.assertEqual(lorem((lock,)), 1)
+		self.assertEqual(lorem((lock,)), 1)
+		self.assertEqual(len(callList), 3)
+
 if (__name__ == "__main__"):
 	# print(is_container([{"a":1, "b":2}, {"a":1, "b":2}]))
 	# print(is_container([{"a":1, "b":2}, {"a":1, "b":2}], elementCriteria=(None, dict)))
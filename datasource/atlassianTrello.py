@@ -3,11 +3,12 @@ import sys
 import logging
 import contextlib
 
-import trello
-
 import PyUtilities.common
+import PyUtilities.lazyLoad
 from PyUtilities.datasource.common import config
 
+trello = PyUtilities.lazyLoad.load("trello")
+
 @contextlib.contextmanager
 def getConnection(board_id, *, connection=None, **kwargs):
 	""" Retuns an object to use for connecting to Rent Manager.
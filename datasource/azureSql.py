@@ -3,11 +3,12 @@ import sys
 import logging
 import contextlib
 
-import pyodbc
-
 import PyUtilities.common
+import PyUtilities.lazyLoad
 from PyUtilities.datasource.common import config
 
+pyodbc = PyUtilities.lazyLoad.load("pyodbc")
+
 @contextlib.contextmanager
 def getConnection(*, _self=None, driver="ODBC Driver 18 for SQL Server", connection=None, configKwargs=None, 
 	host=None, dbname=None, user=None, password=None, port=None, **kwargs):
@@ -4,14 +4,16 @@ import sys
 import logging
 
 import pandas
-from azure.storage.blob import BlobServiceClient
-import azure.core.exceptions
 
 import PyUtilities.common
+import PyUtilities.lazyLoad
 import PyUtilities.testing
 import PyUtilities.datasource.general
 from PyUtilities.datasource.common import config
 
+azure = PyUtilities.lazyLoad.load("azure.storage.blob")
+PyUtilities.lazyLoad.load("azure.core.exceptions")
+
 def getConnection(container, *, account_name="rpbireporting", account_key=None, configKwargs=None, connection=None, **kwargs):
 	""" Returns a blob storage connection.
 
@@ -100,7 +102,7 @@ def insert(data, container="postgres", folder=None, filename=None, *, method="up
 
 		found = True
 		logging.info(f"Uploading blob to '{destination}'...")
-		connection.client.upload_blob(name=destination, data=handle_binary.read())
+		connection.client.upload_blob(name=destination, data=handle_binary)
 
 	if (not found):
 		raise ValueError("No files were found")
@@ -249,7 +251,7 @@ class BlobConnection:
 	"""
 
 	def __init__(self, connection_string, container_name):
-		service_client = BlobServiceClient.from_connection_string(connection_string)
+		service_client = azure.storage.blob.BlobServiceClient.from_connection_string(connection_string)
 		self.client = service_client.get_container_client(container_name)
 
 	def upload(self, source, dest):
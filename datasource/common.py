@@ -1,6 +1,9 @@
 import os
+import time
 import pandas
+import requests
 import platform
+import tempfile
 import configparser
 
 import PyUtilities.json_expanded
@@ -13,34 +16,104 @@ is_dev = (platform.node() == "DESKTOP-8J5RE8C")
 detaultConfig = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "settings.ini")
 
 parser = None
-def config(_key=None, _section="postgres_prod", *, filename=detaultConfig, useCached=False, defaultValue=None, key=None, section=None, **kwargs):
+config_catalogue = {}
+config_statInterval = 2
+def config(_key=None, _section="postgres_prod", *, filename=detaultConfig, useCached=None, defaultValue=None, key=None, section=None, **kwargs):
 	""" Reads value(s) from the config file.
+	The parsed file is kept for each *filename* and only read again once its modified time or size changes.
+	The file is checked at most once every *config_statInterval* seconds.
 
 	section (str) - Which ini section to read from
 	key (str) - Which key to return from the ini file
 		- If None: Returns a dictionary of all items in *section*
 	filename (str) - Where the ini file is located
 	useCached (bool) - If the config file loaded last time should be reused
+		- If None: Reuse it unless the file has changed
+		- If True: Reuse it without checking the file
+		- If False: Always read the file again
 	defaultValue (any) - What shoudl be used if *key* is not in *section*
 
 	Example Input: config()
 	Example Input: config(section="ipsum")
 	Example Input: config(filename="lorem.ini")
 	Example Input: config(key="token", section="dropbox")
+	Example Input: config(key="token", section="dropbox", useCached=False)
 	"""
 	global parser
 
+	def getSignature():
+		try:
+			info = os.stat(filename)
+			return (info.st_mtime_ns, info.st_size)
+		except OSError:
+			return None
+
+	def getCache():
+		cache = config_catalogue.get(filename)
+		now = time.monotonic()
+
+		if (cache and (useCached or ((useCached is None) and (now - cache["checked"] < config_statInterval)))):
+			return cache
+
+		signature = getSignature()
+		if (cache and (useCached is None) and (cache["signature"] == signature)):
+			cache["checked"] = now
+			return cache
+
+		_parser = configparser.ConfigParser()
+		_parser.read(filename)
+
+		cache = config_catalogue[filename] = {"parser": _parser, "signature": signature, "checked": now, "sections": {}}
+		return cache
+
+	#########################
+
 	key = key or _key
 	section = section or _section
 
-	if (not useCached or not parser):
-		parser = configparser.ConfigParser()
-		parser.read(filename)
- 
-	if (not parser.has_section(section)):
-		raise ValueError(f"Section '{section}' not found in the '{filename}' file")
+	cache = getCache()
+	parser = cache["parser"]
+
+	catalogue = cache["sections"].get(section)
+	if (catalogue is None):
+		if (not parser.has_section(section)):
+			raise ValueError(f"Section '{section}' not found in the '{filename}' file")
+
+		catalogue = cache["sections"][section] = {key: value for (key, value) in parser.items(section)}
 
 	if (key):
-		return parser[section].get(key, defaultValue)
+		return catalogue.get(parser.optionxform(key), defaultValue)
+
+	return dict(catalogue)
+
+def download(url, *, spool_size=16 * 1024 * 1024, chunk_size=1024 * 1024, method="GET", headers=None, **kwargs):
+	""" Streams the contents of *url* into a temporary file handle.
+	The file stays in memory until it is bigger than *spool_size* bytes, then it moves to disk.
+	Returns the handle at position 0 with the response's content type as *contentType*; the caller should close it.
+	Raises a requests.HTTPError for an error status, instead of returning the error page as the file.
+	See: https://requests.readthedocs.io/en/latest/user/advanced/#body-content-workflow
+	See: https://docs.python.org/3/library/tempfile.html#tempfile.SpooledTemporaryFile
+
+	spool_size (int) - How many bytes can be held in memory
+	chunk_size (int) - How many bytes to read from the response at a time
+	kwargs (any) - Passed to *requests.request*
+
+	Example Input: download("https://www.lorem.com/ipsum.csv")
+	Example Input: download(url, headers={"Authorization": f"Bearer {token}"})
+	"""
+
+	with requests.request(method, url, stream=True, headers=headers or {}, **kwargs) as response:
+		response.raise_for_status()
+
+		handle_bytes = tempfile.SpooledTemporaryFile(max_size=spool_size)
+		try:
+			for chunk in response.iter_content(chunk_size=chunk_size):
+				handle_bytes.write(chunk)
+		except Exception as error:
+			handle_bytes.close()
+			raise error
+
+		handle_bytes.contentType = response.headers.get("content-type")
 
-	return {key: value for (key, value) in parser.items(section)}
\ No newline at end of file
+	handle_bytes.seek(0)
+	return handle_bytes
\ No newline at end of file
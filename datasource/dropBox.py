@@ -2,12 +2,13 @@ import os
 import sys
 import logging
 
-import dropbox
-
 import PyUtilities.testing
+import PyUtilities.lazyLoad
 import PyUtilities.datasource.general
 from PyUtilities.datasource.common import config
 
+dropbox = PyUtilities.lazyLoad.load("dropbox")
+
 def insert(data, container="systems_data/report_data_source", folder=None, filename=None, *, method="upsert", token=None, chunk_size=145, configKwargs=None, **kwargs):
 	""" Sends data to dropbox.
 	See: https://riptutorial.com/dropbox-api/example/1927/uploading-a-file-using-the-dropbox-python-sdk
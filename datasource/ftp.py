@@ -7,11 +7,13 @@ import datetime
 import contextlib
 
 import pandas
-import pysftp
 
 import PyUtilities.common
+import PyUtilities.lazyLoad
 from PyUtilities.datasource.common import config
 
+pysftp = PyUtilities.lazyLoad.load("pysftp")
+
 @contextlib.contextmanager
 def getConnection(login_user=None, login_password=None, login_host=None, *, connection=None, configKwargs=None, **kwargs):
 	""" Retuns an object to use for connecting to an FTP server.
@@ -2,19 +2,25 @@ import io
 import os
 import re
 import sys
+import bz2
+import csv
+import gzip
 import json
+import lzma
 import time
 import math
-import boto3
+import hashlib
 import types
 import string
 import decimal
+import tempfile
 import logging
 import zipfile
 import datetime
 import requests
 import itertools
 import functools
+import concurrent.futures
 import mimetypes
 import traceback
 import contextlib
@@ -22,35 +28,548 @@ import configparser
 import urllib.parse
 import dateutil.relativedelta
 
-import bs4
-import msal
 import numpy
 import pandas
-import pyodbc
-import pysftp
-import trello
 import asyncio
-import dropbox
 import dateutil
-import netsuite
-import openpyxl
-import pymsteams
 
-import psycopg2
-import psycopg2.extras
-
-import webflowpy.Webflow
 import xml.etree.ElementTree
 
+import PyUtilities.lazyLoad
+
+# These are only imported the first time they are used
+bs4 = PyUtilities.lazyLoad.load("bs4")
+msal = PyUtilities.lazyLoad.load("msal")
+boto3 = PyUtilities.lazyLoad.load("boto3")
+pyodbc = PyUtilities.lazyLoad.load("pyodbc")
+pysftp = PyUtilities.lazyLoad.load("pysftp")
+trello = PyUtilities.lazyLoad.load("trello")
+dropbox = PyUtilities.lazyLoad.load("dropbox")
+netsuite = PyUtilities.lazyLoad.load("netsuite")
+openpyxl = PyUtilities.lazyLoad.load("openpyxl")
+pymsteams = PyUtilities.lazyLoad.load("pymsteams")
+webflowpy = PyUtilities.lazyLoad.load("webflowpy.Webflow")
+psycopg2 = PyUtilities.lazyLoad.load("psycopg2.extras")
+pyarrow = PyUtilities.lazyLoad.load("pyarrow.ipc")
+
 import PyUtilities.common
+import PyUtilities.datasource.common
 from PyUtilities.datasource.common import config
 import PyUtilities.datasource.postgres
 
 import PyUtilities.logger
 import PyUtilities.testing
+import PyUtilities.benchmarking
+
+fileFormat_catalogue = {
+	".csv": ("csv", None),
+	".gz": ("csv", "gzip"),
+	".bz2": ("csv", "bz2"),
+	".xz": ("csv", "xz"),
+	".zst": ("csv", "zstd"),
+	".parquet": ("parquet", None),
+	".feather": ("feather", None),
+	".arrow": ("feather", None),
+}
+
+contentType_catalogue = {
+	("csv", None): "text/csv",
+	("csv", "gzip"): "application/gzip",
+	("csv", "bz2"): "application/x-bzip2",
+	("csv", "xz"): "application/x-xz",
+	("csv", "zstd"): "application/zstd",
+	("parquet", None): "application/vnd.apache.parquet",
+	("feather", None): "application/vnd.apache.arrow.file",
+}
+
+decompress_catalogue = {
+	"gzip": gzip.open,
+	"bz2": bz2.open,
+	"xz": lzma.open,
+}
+
+magicBytes_catalogue = {
+	b"PAR1": ("parquet", None),
+	b"ARROW1": ("feather", None),
+	b"FEA1": ("feather", None),
+	b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1": ("excel", None),
+	b"PK\x03\x04": ("csv", "zip"),
+	b"\x1f\x8b": ("csv", "gzip"),
+	b"BZh": ("csv", "bz2"),
+	b"\xfd7zXZ\x00": ("csv", "xz"),
+	b"\x28\xb5\x2f\xfd": ("csv", "zstd"),
+}
+
+filterOperator_catalogue = {
+	"=": lambda series, value: series == value,
+	"==": lambda series, value: series == value,
+	"!=": lambda series, value: series != value,
+	"<": lambda series, value: series < value,
+	"<=": lambda series, value: series <= value,
+	">": lambda series, value: series > value,
+	">=": lambda series, value: series >= value,
+	"in": lambda series, value: series.isin(value),
+	"not in": lambda series, value: ~series.isin(value),
+}
+
+def get_fileFormat(filepath, *, default=("csv", None)):
+	""" Returns what (format, compression) pair to use for *filepath* based on its file extension.
+
+	filepath (str) - What file path or extension to check
+	default (tuple) - What to return if the extension is not in *fileFormat_catalogue*
+
+	Example Input: get_fileFormat("lorem.csv")
+	Example Input: get_fileFormat("lorem.csv.gz")
+	Example Input: get_fileFormat("lorem.parquet")
+	"""
+
+	if (not filepath):
+		return default
+
+	return fileFormat_catalogue.get(os.path.splitext(filepath)[1].lower(), default)
+
+def writeFrame(frame, handle, *, file_format="csv", compression=None):
+	""" Writes *frame* into the binary file handle *handle*.
+	Returns the content type for what was written.
+	See: https://pandas.pydata.org/docs/reference/api/pandas.DataFrame.to_csv.html
+	See: https://pandas.pydata.org/docs/reference/api/pandas.DataFrame.to_parquet.html
+
+	file_format (str) - What kind of file to write
+		- csv: A utf8 csv file
+		- parquet: A parquet file (requires pyarrow)
+	compression (str) - How to compress a csv file
+		- If None: Will not compress it
+		- gzip: Use gzip
+		- zstd: Use zstandard (requires zstandard)
+
+	Example Input: writeFrame(frame, handle)
+	Example Input: writeFrame(frame, handle, compression="gzip")
+	Example Input: writeFrame(frame, handle, file_format="parquet")
+	"""
+
+	match file_format:
+		case "csv":
+			# Pandas wraps binary handles in its own text wrapper, so nothing is buffered as a str first
+			frame.to_csv(handle, header=True, index=False, encoding="utf8", compression=compression and {"method": compression}, date_format=r"%Y-%m-%dT%H:%M:%S.%fZ")
+
+		case "parquet":
+			frame.to_parquet(handle, index=False)
+
+		case "feather":
+			frame.reset_index(drop=True).to_feather(handle)
+
+		case _:
+			raise KeyError(f"Unknown *file_format* '{file_format}'")
+
+	return contentType_catalogue.get((file_format, compression), "application/octet-stream")
+
+def readSample(handle, *, compression=None, sample_size=64 * 1024):
+	""" Returns the first *sample_size* bytes of the file handle or file path *handle*.
+	If *handle* is a file handle, its position is put back to where it was.
+	Returns None if *handle* cannot be rewound or *compression* cannot be read a piece at a time.
+
+	compression (str) - How *handle* is compressed
+		- If not None: The sample will be of the decompressed contents
+
+	Example Input: readSample(handle)
+	Example Input: readSample("lorem.csv.gz", compression="gzip")
+	"""
+
+	def _readSample(_handle):
+		if (compression):
+			with decompress_catalogue[compression](_handle) as handle_decompressed:
+				return handle_decompressed.read(sample_size)
+
+		return _handle.read(sample_size)
+
+	#########################
+
+	if (compression and (compression not in decompress_catalogue)):
+		return None
+
+	if (isinstance(handle, str)):
+		with open(handle, "rb") as handle_file:
+			return _readSample(handle_file)
+
+	if (not handle.seekable()):
+		return None
+
+	position = handle.tell()
+	try:
+		return _readSample(handle)
+	finally:
+		handle.seek(position)
+
+def detectEncoding(handle, *, compression=None, sample_size=64 * 1024, default="Windows-1252", sample=None):
+	""" Guesses what encoding the csv file *handle* uses from its first few bytes.
+	Files with a BOM use that, files that are valid utf8 use utf8, and everything else uses *default*.
+	If *handle* is a file handle, its position is put back to where it was.
+
+	compression (str) - How *handle* is compressed
+	sample_size (int) - How many bytes to look at
+	default (str) - What encoding to use if the sample is not valid utf8
+	sample (bytes) - An already read sample to use instead of reading from *handle*
+
+	Example Input: detectEncoding(handle)
+	Example Input: detectEncoding("lorem.csv")
+	Example Input: detectEncoding("lorem.csv.gz", compression="gzip")
+	"""
+
+	if (sample is None):
+		sample = readSample(handle, compression=compression, sample_size=sample_size)
+
+	if (sample is None):
+		return default
+
+	if (isinstance(sample, str)):
+		return None # Text handles are already decoded
+
+	if (sample.startswith(b"\xef\xbb\xbf")):
+		return "utf-8-sig"
+
+	if (sample.startswith((b"\xff\xfe", b"\xfe\xff"))):
+		return "utf-16"
+
+	try:
+		sample.decode("utf8")
+	except UnicodeDecodeError as error:
+		# The sample may have cut a multi-byte character in half
+		if ((len(sample) < sample_size) or (error.start < len(sample) - 3)):
+			return default
+
+	return "utf8"
+
+def detectDelimiter(sample, *, encoding="utf8", delimiters=",;\t|", default=","):
+	""" Guesses what delimiter the csv sample *sample* uses.
+	The guess is only used if it is unambiguous: every row must split into the same number of values with it, and not also with *default*.
+	This keeps a comma file that has ';' or '|' inside quoted text from being split on the wrong character.
+	See: https://docs.python.org/3/library/csv.html#csv.Sniffer
+
+	sample (bytes) - The first few bytes of the file
+	delimiters (str) - Which delimiters to choose from
+	default (str) - What to use if no delimiter can be found, or if the guess is ambiguous
+
+	Example Input: detectDelimiter(sample)
+	Example Input: detectDelimiter(sample, encoding="utf-16")
+	"""
+
+	if (not sample):
+		return default
+
+	text = sample.decode(encoding or "utf8", errors="replace") if isinstance(sample, bytes) else sample
+
+	# Only look at whole lines, and not too many of them
+	text = text[:8 * 1024]
+	if ("\n" in text):
+		text = text[:text.rindex("\n")]
+
+	def getFieldCounts(delimiter):
+		try:
+			return {len(row) for row in csv.reader(io.StringIO(text), delimiter=delimiter) if row}
+		except csv.Error:
+			return set()
+
+	def is_consistent(delimiter):
+		counts = getFieldCounts(delimiter)
+		return (len(counts) == 1) and (counts.pop() > 1)
+
+	#########################
+
+	try:
+		delimiter = csv.Sniffer().sniff(text, delimiters=delimiters).delimiter
+	except csv.Error:
+		return default
+
+	if ((delimiter == default) or (not is_consistent(delimiter)) or is_consistent(default)):
+		return default
+
+	return delimiter
+
+def getZipFormat(handle):
+	""" Returns what (format, compression) pair the zip file handle or file path *handle* is, by looking at the names in its central directory.
+	xlsx files are zip files with a '[Content_Types].xml' and an 'xl/' folder, which can be anywhere in the archive.
+	If *handle* is a file handle, its position is put back to where it was.
+	See: https://docs.python.org/3/library/zipfile.html#zipfile.ZipFile.namelist
+
+	Example Input: getZipFormat("lorem.xlsx")
+	"""
+
+	position = None if isinstance(handle, str) else handle.tell()
+	try:
+		with zipfile.ZipFile(handle) as handle_zip:
+			nameList = handle_zip.namelist()
+	except zipfile.BadZipFile:
+		return ("csv", "zip")
+	finally:
+		if (position is not None):
+			handle.seek(position)
+
+	if (("[Content_Types].xml" in nameList) or any(name.startswith("xl/") for name in nameList)):
+		return ("excel", None)
+
+	return ("csv", "zip")
+
+def sniffFile(handle, *, sample_size=64 * 1024, default=("csv", None)):
+	""" Guesses how to read the file handle or file path *handle* from its first few bytes.
+	This lets the right reader be picked once, instead of trying one and falling back to another when it fails.
+	Returns a dictionary with the keys 'file_format', 'compression', 'encoding', and 'delimiter'.
+
+	sample_size (int) - How many bytes to look at
+	default (tuple) - What (format, compression) pair to use if the file has no known magic bytes
+		- Use *get_fileFormat* to default to what the file extension says
+
+	Example Input: sniffFile(handle)
+	Example Input: sniffFile("C:/lorem/ipsum.csv", default=get_fileFormat("C:/lorem/ipsum.csv"))
+	"""
+
+	file_format, compression = default
+	info = {"file_format": file_format, "compression": compression, "encoding": None, "delimiter": None}
+
+	header = readSample(handle, sample_size=1024)
+	if (header is None):
+		return info
+
+	if (isinstance(header, str)):
+		info["file_format"] = "csv"
+		info["compression"] = None
+		info["delimiter"] = detectDelimiter(readSample(handle, sample_size=sample_size))
+		return info
+
+	for (magic, value) in magicBytes_catalogue.items():
+		if (header.startswith(magic)):
+			file_format, compression = value
+			break
+	else:
+		file_format, compression = ("csv", None) # Binary and compressed formats always have their magic bytes
+
+	if (compression == "zip"):
+		file_format, compression = getZipFormat(handle) # xlsx files are zip files
+
+	info["file_format"] = file_format
+	info["compression"] = compression
+	if (file_format != "csv"):
+		return info
+
+	sample = readSample(handle, compression=compression, sample_size=sample_size)
+	if (sample is not None):
+		info["encoding"] = detectEncoding(handle, sample=sample, sample_size=sample_size)
+		info["delimiter"] = detectDelimiter(sample, encoding=info["encoding"])
+
+	return info
+
+def yield_excelRows(handle, *, sheet_name=0):
+	""" A generator that yields the rows of a sheet in the excel file *handle* as lists, with each value converted the way *pandas.read_excel* does.
+	The workbook is opened in read only mode and its rows are streamed, so the workbook is never held in memory at once.
+	Empty cells become '', whole numbers stored as floats become ints, trailing empty cells are dropped, and trailing empty rows are never yielded.
+	Error cells (like '#DIV/0!') become NaN.
+	See: https://openpyxl.readthedocs.io/en/stable/optimized.html#read-only-mode
+
+	Example Input: yield_excelRows("lorem.xlsx")
+	Example Input: yield_excelRows(handle, sheet_name="Ipsum")
+	"""
+
+	errorList = set(openpyxl.cell.cell.ERROR_CODES)
+
+	def convertCell(value):
+		if (value is None):
+			return ""
+
+		if (type(value) is float):
+			return int(value) if value.is_integer() else value
+
+		if ((type(value) is str) and (value in errorList)):
+			return numpy.nan
+
+		return value
+
+	#########################
+
+	workbook = openpyxl.load_workbook(handle, read_only=True, data_only=True, keep_links=False)
+	try:
+		worksheet = workbook.worksheets[sheet_name] if isinstance(sheet_name, int) else workbook[sheet_name]
+		worksheet.reset_dimensions() # Some programs write the wrong sheet size
+
+		blank_count = 0
+		for row in worksheet.iter_rows(values_only=True):
+			row = [convertCell(value) for value in row]
+			while (row and (row[-1] == "")):
+				row.pop()
+
+			if (not row):
+				blank_count += 1 # Only keep blank rows that have data after them
+				continue
+
+			for _ in range(blank_count):
+				yield []
+			blank_count = 0
+
+			yield row
+	finally:
+		workbook.close()
+
+def parseExcelRows(rowList, *, columns=None):
+	""" Returns a pandas frame for rows from *yield_excelRows*, where the first row is the header.
+	Column names and data types are worked out by the same parser *pandas.read_excel* uses, so the answer matches it.
+	See: https://pandas.pydata.org/docs/reference/api/pandas.io.parsers.TextParser.html
+
+	Example Input: parseExcelRows(list(yield_excelRows("lorem.xlsx")))
+	"""
+
+	if (not rowList):
+		return pandas.DataFrame(columns=columns or ())
+
+	# Every row needs to be as wide as the widest one
+	width = max(len(row) for row in rowList)
+	rowList = [row if (len(row) == width) else [*row, *([""] * (width - len(row)))] for row in rowList]
+
+	return pandas.io.parsers.TextParser(rowList, header=0, usecols=columns, skip_blank_lines=False).read()
+
+def yield_excelChunk(handle, *, sheet_name=0, columns=None, chunk_size=50000, engine=None):
+	""" A generator that yields pandas frames of up to *chunk_size* rows from a sheet in the excel file *handle*.
+	The rows are streamed (see *yield_excelRows*), so only one chunk is held in memory at once.
+	Each chunk works out its own data types, so a column can have a different type in different chunks; use *readFrame* to read the whole sheet like *pandas.read_excel* does.
+	See: https://pandas.pydata.org/docs/reference/api/pandas.read_excel.html
+
+	handle (any) - A file handle or file path
+	sheet_name (str or int) - Which sheet to read
+		- If int: The index of the sheet
+	columns (list) - Which columns to read
+		- If None: Will read all columns
+	chunk_size (int) - How many rows to put in each frame
+		- If None: Will yield the whole sheet as one frame
+	engine (str) - Which reader to use
+		- If None: Use openpyxl in read only mode, or pandas for xls files
+		- calamine: Use the rust based calamine reader through pandas (requires python-calamine)
+
+	Example Input: yield_excelChunk("lorem.xlsx")
+	Example Input: yield_excelChunk("lorem.xlsx", sheet_name="Ipsum", columns=("dolor", "sit"), chunk_size=10000)
+	Example Input: yield_excelChunk(handle, engine="calamine")
+	"""
+
+	columns = list(columns) if columns else None
+	sample = readSample(handle, sample_size=8)
+	is_xls = bool(sample and magicBytes_catalogue.get(sample) == ("excel", None))
+
+	if ((engine is not None) or is_xls):
+		frame = pandas.read_excel(handle, sheet_name=sheet_name, usecols=columns, engine=engine)
+		if ((not chunk_size) or (len(frame) <= chunk_size)):
+			yield frame
+			return
+
+		for index in range(0, len(frame), chunk_size):
+			yield frame.iloc[index:index + chunk_size].reset_index(drop=True)
+		return
+
+	rowList = yield_excelRows(handle, sheet_name=sheet_name)
+	header = next(rowList, None)
+	if (header is None):
+		yield parseExcelRows([], columns=columns)
+		return
+
+	yielded = False
+	for chunk in (PyUtilities.common.yieldChunk(rowList, chunk_size) if chunk_size else (tuple(rowList),)):
+		yield parseExcelRows([header, *chunk], columns=columns)
+		yielded = True
+
+	if (not yielded):
+		yield parseExcelRows([header], columns=columns)
+
+def readFrame(handle, *, file_format="csv", compression=None, columns=None, filters=None, encoding=None, delimiter=None, engine=None, sheet_name=0, excel_engine=None):
+	""" Reads a pandas frame from the file handle or file path *handle*.
+	See: https://pandas.pydata.org/docs/reference/api/pandas.read_parquet.html
+	See: https://arrow.apache.org/docs/python/generated/pyarrow.parquet.read_table.html
+
+	file_format (str) - What kind of file *handle* is
+		- csv: A csv file
+		- parquet: A parquet file (requires pyarrow)
+		- feather: A feather / arrow ipc file (requires pyarrow)
+		- excel: An xlsx or xls file
+	compression (str) - How a csv file is compressed
+	columns (list) - Which columns to read
+		- If None: Will read all columns
+	filters (list) - Which rows to keep as a list of (column, operator, value) tuples
+		- If list of lists: Rows matching any of the inner lists are kept
+		- For parquet files these are pushed down into the reader, so skipped row groups are never loaded
+	encoding (str) - What encoding a csv file uses
+		- If None: Will use *detectEncoding*
+	delimiter (str) - What separates values in a csv file
+		- If None: Will use ','
+		- *parseFrame* passes in what *detectDelimiter* found when it is not given one
+	engine (str) - Which parser to use for csv files
+		- If None: Use the default pandas parser
+		- pyarrow: Use the multi-threaded pyarrow parser (requires pyarrow)
+	sheet_name (str or int) - Which sheet to read from an excel file
+	excel_engine (str) - Which reader to use for excel files (see *yield_excelChunk*)
+
+	Example Input: readFrame(handle)
+	Example Input: readFrame(handle, engine="pyarrow")
+	Example Input: readFrame("lorem.csv.gz", compression="gzip")
+	Example Input: readFrame(handle, file_format="parquet", columns=["lorem", "ipsum"])
+	Example Input: readFrame(handle, file_format="parquet", filters=[("lorem", ">", 5)])
+	Example Input: readFrame(handle, file_format="parquet", filters=[[("lorem", "=", 1)], [("ipsum", "in", ("a", "b"))]])
+	Example Input: readFrame("lorem.xlsx", file_format="excel", sheet_name="Ipsum", columns=["dolor"])
+	"""
+
+	columns = list(columns) if columns else None
+	if (file_format == "parquet"):
+		return pandas.read_parquet(handle, columns=columns, filters=filters or None)
+
+	# Columns that are only filtered on still need to be read
+	columns_read = columns
+	if (columns and filters):
+		columns_read = [*columns, *{key for group in (filters if isinstance(filters[0], list) else (filters,)) for (key, _, _) in group if (key not in columns)}]
+
+	match file_format:
+		case "csv":
+			if (encoding is None):
+				encoding = detectEncoding(handle, compression=compression)
+
+			frame = pandas.read_csv(handle, sep=delimiter or ",", encoding=encoding, compression=compression and {"method": compression}, usecols=columns_read, engine=engine)
+
+		case "feather":
+			frame = pandas.read_feather(handle, columns=columns_read)
+
+		case "excel":
+			sample = readSample(handle, sample_size=8)
+			if ((excel_engine is not None) or (sample and (magicBytes_catalogue.get(sample) == ("excel", None)))):
+				frame = pandas.read_excel(handle, sheet_name=sheet_name, usecols=columns_read, engine=excel_engine)
+			else:
+				# Data types are worked out once for the whole sheet, like pandas.read_excel does
+				frame = parseExcelRows(list(yield_excelRows(handle, sheet_name=sheet_name)), columns=columns_read)
+
+		case _:
+			raise KeyError(f"Unknown *file_format* '{file_format}'")
+
+	if (filters):
+		frame = frame[getFilterMask(frame, filters)].reset_index(drop=True)
+
+	if (columns_read is not columns):
+		frame = frame[columns]
+
+	return frame
+
+def getFilterMask(frame, filters):
+	""" Returns a boolean series for which rows in *frame* match *filters*.
+	Uses the same (column, operator, value) format as pyarrow.
+
+	Example Input: getFilterMask(frame, [("lorem", ">", 5)])
+	Example Input: getFilterMask(frame, [[("lorem", "=", 1)], [("ipsum", "in", ("a", "b"))]])
+	"""
+
+	groupList = filters if isinstance(filters[0], list) else (filters,)
+
+	mask = pandas.Series(False, index=frame.index)
+	for group in groupList:
+		mask_group = pandas.Series(True, index=frame.index)
+		for (column, operator, value) in group:
+			mask_group &= filterOperator_catalogue[operator](frame[column], value)
+		mask |= mask_group
+
+	return mask
 
 def yield_fileOutput(data, folder=None, filename=None, *, input_type="csv", can_yield_pandas=False,
-	data_hasHeader=False, filterInput_pre=None, filterInput=None, walk_allow=("csv", "xlsx", "xls"), **kwargs):
+	data_hasHeader=False, filterInput_pre=None, filterInput=None, walk_allow=("csv", "xlsx", "xls", "parquet", "feather", "arrow"),
+	output_format=None, spool_size=16 * 1024 * 1024, parse_file=None, parallel=None, parallel_inflight=None, parallel_process=False, **kwargs):
 	""" A generator that yields file handles and their intended destinations based on the input criteria.
 	See: https://pandas.pydata.org/docs/reference/api/pandas.DataFrame.to_csv.html
 	See: https://stackoverflow.com/questions/13120127/how-can-i-use-io-stringio-with-the-csv-module/45608450#45608450
@@ -69,12 +588,28 @@ def yield_fileOutput(data, folder=None, filename=None, *, input_type="csv", can_
 			- Can be a container
 	walk_allow (tuple) - What file extensions to allow from walking the directory for *input_type*
 	can_yield_pandas (bool) - If a pandas frame can be yielded instead of a file buffer
+	output_format (str) - What kind of file to make when *input_type* is 'csv'
+		- If None: Will use the file extension of *filename* (see *fileFormat_catalogue*)
+		- csv: A plain csv file
+		- csv.gz: A gzip compressed csv file
+		- csv.zst: A zstandard compressed csv file
+		- parquet: A parquet file
+	spool_size (int) - How many bytes a written file can be before it is moved from memory into a temporary file on disk
+	parse_file (function) - What to use for turning a walked file path into a pandas frame when *parallel* is used (see *parseFrame*)
+	parallel (int) - How many walked files to parse at once for *input_type* 'file'; yields what *parse_file* returns instead of file handles
+		- If None: Will yield a file handle for each file one at a time
+		- Files are still yielded in the order they were walked in
+	parallel_inflight (int) - How many parsed files can be waiting to be yielded at once (see *PyUtilities.common.yieldParallel*)
+	parallel_process (bool) - If a process pool should be used instead of a thread pool
 
 	Example Input: yield_fileOutput([{Lorem: "ipsum"}])
 	Example Input: yield_fileOutput([{Lorem: "ipsum"}], folder="rps")
+	Example Input: yield_fileOutput([{Lorem: "ipsum"}], filename="lorem.csv.gz")
+	Example Input: yield_fileOutput(frame, filename="lorem", output_format="parquet")
 	Example Input: yield_fileOutput({Lorem: "ipsum"}, input_type="json")
 	Example Input: yield_fileOutput("C:/lorem/ipsum", input_type="file")
 	Example Input: yield_fileOutput("C:/lorem/ipsum", input_type="file", walk_allow=("csv"))
+	Example Input: yield_fileOutput("C:/lorem/ipsum", input_type="file", parse_file=parseFrame, parallel=8)
 	Example Input: yield_fileOutput(open("lorem.txt", "r"), filename="lorem.txt", input_type="raw")
 	Example Input: yield_fileOutput("SELECT * FROM lorem", input_type="postgres")
 	Example Input: yield_fileOutput({"query_sql": SELECT * FROM lorem WHERE ipsum = %s", "query_args": (1,), input_type="postgres")
@@ -89,6 +624,18 @@ def yield_fileOutput(data, folder=None, filename=None, *, input_type="csv", can_
 
 		return (not isinstance(_item, dict))
 
+	def yieldWalk(folder_source):
+		for (root, folderList, files) in os.walk(folder_source):
+			folderList.sort() # Walk in the same order every time
+			for filename_source in sorted(files):
+				if (filename_source.startswith("~")):
+					continue
+
+				if (os.path.splitext(filename_source)[1][1:] not in walk_allow):
+					continue
+
+				yield (os.path.join(root, filename_source), os.path.join(folder or "", filename or filename_source).replace("\\", "/"))
+
 	def formatReturn(handle, _info, destination):
 		answer = [handle]
 
@@ -120,7 +667,7 @@ def yield_fileOutput(data, folder=None, filename=None, *, input_type="csv", can_
 		match _input_type:
 			case "mixed":
 				if (isinstance(item, dict)):
-					for _item in yield_fileOutput((item,), folder, filename, input_type="csv", filterInput_pre=filterInput_pre, filterInput=filterInput, can_yield_pandas=can_yield_pandas, walk_allow=walk_allow, data_hasHeader=data_hasHeader, **kwargs):
+					for _item in yield_fileOutput((item,), folder, filename, input_type="csv", filterInput_pre=filterInput_pre, filterInput=filterInput, can_yield_pandas=can_yield_pandas, walk_allow=walk_allow, data_hasHeader=data_hasHeader, output_format=output_format, spool_size=spool_size, parse_file=parse_file, parallel=parallel, parallel_inflight=parallel_inflight, parallel_process=parallel_process, **kwargs):
 						found = True
 						yield _item
 					continue
@@ -132,7 +679,7 @@ def yield_fileOutput(data, folder=None, filename=None, *, input_type="csv", can_
 				else:
 					raise KeyError(f"Unknown mixed type '{item}'")
 
-				for _item in yield_fileOutput(item, folder, filename, input_type=_input_type, filterInput_pre=filterInput_pre, filterInput=filterInput, can_yield_pandas=can_yield_pandas, walk_allow=walk_allow, data_hasHeader=data_hasHeader, **kwargs):
+				for _item in yield_fileOutput(item, folder, filename, input_type=_input_type, filterInput_pre=filterInput_pre, filterInput=filterInput, can_yield_pandas=can_yield_pandas, walk_allow=walk_allow, data_hasHeader=data_hasHeader, output_format=output_format, spool_size=spool_size, parse_file=parse_file, parallel=parallel, parallel_inflight=parallel_inflight, parallel_process=parallel_process, **kwargs):
 					found = True
 					yield _item
 
@@ -188,23 +735,16 @@ def yield_fileOutput(data, folder=None, filename=None, *, input_type="csv", can_
 					continue
 
 				if (_item.startswith("http")):
-					response = requests.request("GET", _item,
-						headers={},
-						data={},
-					)
-
-					handle_bytes = io.BytesIO(response.content)
-					handle_bytes.contentType = response.headers['content-type']
-
-					if (filterInput and (not filterInput(handle_bytes, _info, destination))):
-						continue
-					found = True
-					yield formatReturn(handle_bytes, _info, destination)
+					with PyUtilities.datasource.common.download(_item, spool_size=spool_size) as handle_bytes:
+						if (filterInput and (not filterInput(handle_bytes, _info, destination))):
+							continue
+						found = True
+						yield formatReturn(handle_bytes, _info, destination)
 				else:
 					if (os.path.splitext(_item)[1]):
 						destination = os.path.join(folder or "", os.path.basename(_item)).replace("\\", "/")
 						with open(_item, "rb") as handle_file:
-							handle_file.contentType = mimetypes.guess_type(_item)
+							handle_file.contentType = contentType_catalogue.get(get_fileFormat(_item, default=None)) or mimetypes.guess_type(_item)
 
 							if (filterInput and (not filterInput(handle_file, _info, destination))):
 								continue
@@ -212,23 +752,23 @@ def yield_fileOutput(data, folder=None, filename=None, *, input_type="csv", can_
 							yield formatReturn(handle_file, _info, destination)
 							continue
 
-					for (root, _, files) in os.walk(_item):
-						for filename_source in files:
-							if (filename_source.startswith("~")):
-								continue
-
-							if (os.path.splitext(filename_source)[1][1:] not in walk_allow):
+					if (parallel and parse_file):
+						walkList = tuple(yieldWalk(_item))
+						for ((source, destination), frame) in zip(walkList, PyUtilities.common.yieldParallel(parse_file, (source for (source, _) in walkList), workers=parallel, max_inflight=parallel_inflight, use_process=parallel_process)):
+							if (filterInput and (not filterInput(frame, _info, destination))):
 								continue
+							found = True
+							yield formatReturn(frame, _info, destination)
+						continue
 
-							source = os.path.join(root, filename_source)
-							destination = os.path.join(folder or "", filename or filename_source).replace("\\", "/")
-							with open(source, "rb") as handle_file:
-								handle_file.contentType = mimetypes.guess_type(source)
+					for (source, destination) in yieldWalk(_item):
+						with open(source, "rb") as handle_file:
+							handle_file.contentType = contentType_catalogue.get(get_fileFormat(source, default=None)) or mimetypes.guess_type(source)
 
-								if (filterInput and (not filterInput(handle_file, _info, destination))):
-									continue
-								found = True
-								yield formatReturn(handle_file, _info, destination)
+							if (filterInput and (not filterInput(handle_file, _info, destination))):
+								continue
+							found = True
+							yield formatReturn(handle_file, _info, destination)
 
 			case "csv":
 				data_isPandas = isinstance(_item, pandas.DataFrame)
@@ -240,20 +780,21 @@ def yield_fileOutput(data, folder=None, filename=None, *, input_type="csv", can_
 					yield formatReturn(_item, _info, destination)
 					continue
 
-				with io.StringIO(newline="") as handle_csv:
-					frame = _item if data_isPandas else pandas.DataFrame(_item)
-					
-					if (can_yield_pandas):
-						if (filterInput and (not filterInput(frame, _info, destination))):
-							continue
-						found = True
-						yield formatReturn(frame, _info, destination)
+				frame = _item if data_isPandas else pandas.DataFrame(_item)
+				
+				if (can_yield_pandas):
+					if (filterInput and (not filterInput(frame, _info, destination))):
 						continue
+					found = True
+					yield formatReturn(frame, _info, destination)
+					continue
 
-					frame.to_csv(handle_csv, header=True, index=False, date_format=r"%Y-%m-%dT%H:%M:%S.%fZ")
-					
-					handle_bytes = io.BytesIO(handle_csv.getvalue().encode('utf8'))
-					handle_bytes.contentType = "text/csv"
+				file_format, compression = get_fileFormat(f".{output_format.split('.')[-1]}" if output_format else destination)
+
+				# See: https://docs.python.org/3/library/tempfile.html#tempfile.SpooledTemporaryFile
+				with tempfile.SpooledTemporaryFile(max_size=spool_size) as handle_bytes:
+					handle_bytes.contentType = writeFrame(frame, handle_bytes, file_format=file_format, compression=compression)
+					handle_bytes.seek(0)
 
 					if (filterInput and (not filterInput(handle_bytes, _info, destination))):
 						continue
@@ -266,6 +807,128 @@ def yield_fileOutput(data, folder=None, filename=None, *, input_type="csv", can_
 	if (not found):
 		logging.info(f"No data to found")
 
+frameCache_folder = os.path.join(tempfile.gettempdir(), "PyUtilities_frameCache")
+
+def getFrameCachePath(filepath, cache_folder=None, **kwargs):
+	""" Returns where a parsed copy of *filepath* would be stored in the frame cache.
+	The path changes if the file's size or modified time change, or if different *kwargs* are used to parse it.
+
+	filepath (str) - Which source file to look up
+	cache_folder (str) - Where the cache is
+		- If None: Will use *frameCache_folder*
+	kwargs (any) - What reader options were used to parse the file
+
+	Example Input: getFrameCachePath("C:/lorem/ipsum.xlsx")
+	Example Input: getFrameCachePath("C:/lorem/ipsum.csv", columns=("lorem",), engine="pyarrow")
+	"""
+
+	info = os.stat(filepath)
+	key = repr((os.path.abspath(filepath), info.st_size, info.st_mtime_ns, sorted(kwargs.items())))
+
+	return os.path.join(cache_folder or frameCache_folder, f"{hashlib.sha1(key.encode('utf8')).hexdigest()}.parquet")
+
+def pruneFrameCache(cache_folder=None, max_size=2 * 1024 ** 3):
+	""" Removes the least recently used files from the frame cache until it is no bigger than *max_size* bytes.
+
+	Example Input: pruneFrameCache()
+	Example Input: pruneFrameCache("C:/lorem/cache", max_size=0)
+	"""
+
+	cache_folder = cache_folder or frameCache_folder
+	if (not os.path.isdir(cache_folder)):
+		return
+
+	fileList = []
+	for item in os.scandir(cache_folder):
+		if (item.is_file()):
+			info = item.stat()
+			fileList.append((info.st_mtime, info.st_size, item.path))
+
+	total = sum(size for (_, size, _) in fileList)
+	for (_, size, filepath) in sorted(fileList):
+		if (total <= max_size):
+			return
+
+		with contextlib.suppress(FileNotFoundError):
+			os.remove(filepath)
+		total -= size
+
+def parseFrame(handle_binary, destination=None, *, is_json=False, is_excel=False, columns=None, filters=None, encoding=None, delimiter=None, engine=None,
+	sheet_name=0, excel_engine=None, cache=None, cache_maxSize=2 * 1024 ** 3):
+	""" Returns a pandas frame for what *yield_fileOutput* yielded.
+
+	handle_binary (any) - A file handle, file path, pandas frame, or list of rows
+	destination (str) - Where *handle_binary* was meant to go; used to guess the file format if the handle has no name
+	delimiter (str) - What separates values in csv files
+		- If None: Will use *detectDelimiter*, which falls back to ',' when unsure
+	sheet_name (str or int) - Which sheet to read from excel files
+	excel_engine (str) - Which reader to use for excel files (see *yield_excelChunk*)
+	cache (bool or str) - If files on disk should be parsed once and then loaded from a parquet copy until they change
+		- If str: Which folder to keep the cache in
+		- If True: Will use *frameCache_folder*
+	cache_maxSize (int) - How many bytes the cache folder can use before the least recently used files are removed
+
+	Example Input: parseFrame(handle_binary)
+	Example Input: parseFrame("C:/lorem/ipsum.xlsx", is_excel=True)
+	Example Input: parseFrame("C:/lorem/ipsum.xlsx", sheet_name="Dolor", columns=("sit", "amet"))
+	Example Input: parseFrame(handle_binary, destination, columns=("lorem", "ipsum"), engine="pyarrow")
+	Example Input: parseFrame("C:/lorem/ipsum.xlsx", is_excel=True, cache=True)
+	"""
+
+	if (cache):
+		filepath = handle_binary if isinstance(handle_binary, str) else getattr(handle_binary, "name", None)
+		if (isinstance(filepath, str) and os.path.isfile(filepath)):
+			cache_folder = cache if isinstance(cache, str) else frameCache_folder
+			cache_path = getFrameCachePath(filepath, cache_folder, is_json=is_json, is_excel=is_excel, columns=columns, filters=filters, encoding=encoding, delimiter=delimiter, engine=engine,
+				sheet_name=sheet_name, excel_engine=excel_engine)
+
+			try:
+				frame = pandas.read_parquet(cache_path)
+				os.utime(cache_path)
+				logging.debug(PyUtilities.logger.debugging and f"Loaded '{filepath}' from the frame cache")
+				return frame
+			except FileNotFoundError:
+				pass
+
+			frame = parseFrame(handle_binary, destination, is_json=is_json, is_excel=is_excel, columns=columns, filters=filters, encoding=encoding, delimiter=delimiter, engine=engine,
+				sheet_name=sheet_name, excel_engine=excel_engine)
+
+			os.makedirs(cache_folder, exist_ok=True)
+			cache_path_temp = f"{cache_path}.{os.getpid()}.{id(frame)}.tmp"
+			try:
+				frame.to_parquet(cache_path_temp, index=False)
+				os.replace(cache_path_temp, cache_path)
+			except Exception as error:
+				# Some frames cannot be stored as parquet (such as object columns with mixed types)
+				logging.info(f"Could not add '{filepath}' to the frame cache; {error}")
+				with contextlib.suppress(FileNotFoundError):
+					os.remove(cache_path_temp)
+				return frame
+
+			pruneFrameCache(cache_folder, max_size=cache_maxSize)
+			return frame
+
+	if (isinstance(handle_binary, pandas.DataFrame)):
+		return handle_binary
+	
+	if (is_json):
+		return pandas.read_json(handle_binary, orient="records", lines=False)
+	
+	if (is_excel):
+		return readFrame(handle_binary, file_format="excel", columns=columns, filters=filters, sheet_name=sheet_name, excel_engine=excel_engine)
+
+	if (isinstance(handle_binary, (list, tuple))):
+		return pandas.DataFrame(handle_binary)
+
+	if (isinstance(handle_binary, str) or hasattr(handle_binary, "read")):
+		# Look at the file's contents so the right reader is used the first time (such as an excel file named '.csv')
+		filepath = handle_binary if isinstance(handle_binary, str) else getattr(handle_binary, "name", None) # Temporary files use their file descriptor as a name
+		info = sniffFile(handle_binary, default=get_fileFormat(filepath if isinstance(filepath, str) else destination))
+		return readFrame(handle_binary, file_format=info["file_format"], compression=info["compression"], columns=columns, filters=filters,
+			encoding=encoding or info["encoding"], delimiter=delimiter or info["delimiter"], engine=engine, sheet_name=sheet_name, excel_engine=excel_engine)
+
+	raise ValueError(f"Unknown data type {type(handle_binary)}")
+
 def get_frame(*args, include_destination=False, data_hasHeader=False, **kwargs):
 	frameList = tuple(yield_frame(*args, include_destination=include_destination, data_hasHeader=data_hasHeader, **kwargs))
 
@@ -285,12 +948,33 @@ def get_frame(*args, include_destination=False, data_hasHeader=False, **kwargs):
 def yield_frame(data, *, is_excel=False, is_json=False, typeCatalogue=None, alias=None, remove=None, modifyData=None, replace_nan=True, no_duplicates=None,
 	sort_by=None, sortByKwargs=None, sort_by_post=None, sortByPostKwargs=None, filterData_pre=None, filterData=None, filterData_post=None, last_modifier=None,
 	string_index=None, string_index__keepValue=None, foreign=None, move=None, connection=None, data_hasHeader=False, can_findNone=False, yieldEmpty=False,
-	onError_decimal=None, onError_int=None, etc=None, etc_post=None, etc_skip=None, include_destination=False, remove_allNull=False, modifyData_pre=None, **kwargs):
+	onError_decimal=None, onError_int=None, etc=None, etc_post=None, etc_skip=None, include_destination=False, remove_allNull=False, modifyData_pre=None,
+	columns=None, filters=None, encoding=None, delimiter=None, csv_engine=None, sheet_name=0, excel_engine=None, cache=None, cache_maxSize=2 * 1024 ** 3, profile=None, transform_workers=None, **kwargs):
 	""" A generator that yields pandas data frames.
 	See: https://stackoverflow.com/questions/46283312/how-to-proceed-with-none-value-in-pandas-fillna/62691803#62691803
 	See: https://github.com/pandas-dev/pandas/issues/25288#issuecomment-463054425
 
 	data (str or DataFrame) - A filepath or pandas frame
+	columns (list) - Which columns to read from files (only these are parsed; see *readFrame*)
+		- If True: Will use the keys of *alias*
+	filters (list) - Which rows to read from files as (column, operator, value) tuples (see *readFrame*)
+	encoding (str) - What encoding csv files use
+		- If None: Will be detected for each file (see *detectEncoding*)
+	delimiter (str) - What separates values in csv files
+		- If None: Will be detected for each file when it is unambiguous, otherwise ',' (see *detectDelimiter*)
+	csv_engine (str) - Which parser to use for csv files (see *readFrame*)
+	sheet_name (str or int) - Which sheet to read from excel files
+	excel_engine (str) - Which reader to use for excel files (see *yield_excelChunk*)
+	parallel (int) - How many files from a walked folder to parse at once (see *yield_fileOutput*)
+	cache (bool or str) - If parsed files should be cached on disk until they change (see *parseFrame*)
+	cache_maxSize (int) - How many bytes the cache can use (see *parseFrame*)
+	profile (bool or str) - If the wall time, cpu time, row counts and memory change of each stage should be recorded for each input
+		- If True: Logs a summary table when done
+		- If str: Also appends a JSON line for this run to that file path
+		- If StageProfiler: Records into that profiler and leaves reporting to the caller
+	transform_workers (int) - How many processes to use for converting data types (see *applyParallel*)
+		- If None: Will convert them in this process
+		- *onError_decimal* and *onError_int* must be picklable to use this
 
 	Example Input: yield_frame(data="./SyncSource/vineyards/acapdetail.csv")
 	Example Input: yield_frame(data="./SyncSource/vineyards/acapdetail.csv", typeCatalogue={"lorem": "datetime"})
@@ -306,6 +990,12 @@ def yield_frame(data, *, is_excel=False, is_json=False, typeCatalogue=None, alia
 	Example Input: yield_frame(data=frame, etc={ "status": ("lorem", "ipsum"), "etc": "sit" })
 	Example Input: yield_frame(data=frame, etc="lorem", etc_post="ipsum")
 	Example Input: yield_frame(data="SELECT * FROM lorem", input_type="postgres")
+	Example Input: yield_frame(data="./SyncSource/vineyards/acapdetail.parquet", input_type="file", columns=("lorem", "ipsum"), filters=[("lorem", ">", 5)])
+	Example Input: yield_frame(data="./SyncSource/vineyards/acapdetail.parquet", input_type="file", alias={"Old Name 1": "new_name_1"}, columns=True)
+	Example Input: yield_frame(data="./SyncSource/vineyards/acapdetail.csv", input_type="file", csv_engine="pyarrow")
+	Example Input: yield_frame(data="./SyncSource/vineyards", input_type="file", parallel=8)
+	Example Input: yield_frame(data="./SyncSource/vineyards", input_type="file", is_excel=True, cache=True)
+	Example Input: yield_frame(data="./SyncSource/vineyards", input_type="file", profile="./profile.jsonl")
 	"""
 
 	def formatReturn(frame, _info, destination):
@@ -366,321 +1056,450 @@ def yield_frame(data, *, is_excel=False, is_json=False, typeCatalogue=None, alia
 				case _:
 					raise KeyError(f"Unknown *typeCatalogue['{key}']* '{value}'")
 
+	if (columns is True):
+		columns = tuple(PyUtilities.common.requiredArg(alias, "Must pass in *alias* if *columns* is True").keys())
+
+	parseKwargs = {"is_json": is_json, "is_excel": is_excel, "columns": columns, "filters": filters, "encoding": encoding, "delimiter": delimiter, "engine": csv_engine,
+		"sheet_name": sheet_name, "excel_engine": excel_engine, "cache": cache, "cache_maxSize": cache_maxSize}
+
+	profiler = profile if isinstance(profile, PyUtilities.logger.StageProfiler) else PyUtilities.logger.StageProfiler(profile if isinstance(profile, str) else None, enabled=bool(profile))
+
 	found = False
-	for (item, destination) in yield_fileOutput(data=data, data_hasHeader=data_hasHeader, **{"can_yield_pandas": True, "connection":connection, **kwargs}):
-		found = True
-		handle_binary, _info = (item if data_hasHeader else (item, None))
+	with (concurrent.futures.ProcessPoolExecutor(max_workers=transform_workers) if transform_workers else contextlib.nullcontext()) as transform_executor:
+		for (item, destination) in profiler.wrap(yield_fileOutput(data=data, data_hasHeader=data_hasHeader, **{"can_yield_pandas": True, "connection":connection, "parse_file": functools.partial(parseFrame, **parseKwargs), **kwargs})):
+			found = True
+			handle_binary, _info = (item if data_hasHeader else (item, None))
 
-		if (isinstance(handle_binary, pandas.DataFrame)):
-			frame = handle_binary
-		
-		elif (is_json):
-			frame = pandas.read_json(handle_binary, orient="records", lines=False)
-		
-		elif (is_excel):
-			frame = pandas.read_excel(handle_binary)
-		
-		elif (isinstance(handle_binary, str)):
-			try:
-				frame = pandas.read_csv(handle_binary, encoding="Windows-1252")
-			except UnicodeDecodeError as error:
-				frame = pandas.read_excel(handle_binary) # What if it was an excel file instead of a csv?
-		
-		elif (isinstance(handle_binary, (list, tuple))):
-			frame = pandas.DataFrame(handle_binary)
-		
-		elif (isinstance(handle_binary, io.BufferedReader)):
-			frame = pandas.read_csv(handle_binary, encoding="Windows-1252")
-		
-		else:
-			raise ValueError(f"Unknown data type {type(handle_binary)}")
-
-		if (frame.empty):
-			if (yieldEmpty):
-				yield formatReturn(frame, _info, destination)
-			continue
-
-		if (modifyData_pre):
-			logging.info("Modifying input data...")
-			for myFunction in PyUtilities.common.ensure_container(modifyData_pre):
-				if (myFunction is not None):
-					response = myFunction(frame)
-					if (response is not None):
-						frame = response
-
-		if (last_modifier and ("last_modifier" not in frame.columns)):
-			frame["last_modifier"] = last_modifier
-
-		if (alias):
-			logging.info("Applying alias to data...")
-			frame.rename(alias, axis=1, inplace=True)
-
-		if (no_duplicates):
-			# TODO: https://stackoverflow.com/questions/20625582/how-to-deal-with-settingwithcopywarning-in-pandas/53954986#53954986
-			logging.info("Removing duplicate rows...")
-			frame.drop_duplicates(subset=list(PyUtilities.common.ensure_container(no_duplicates)), inplace=True)
-
-		if (len(dtype.keys()) or len(datetime_columns)):
-			logging.info("Converting data types...")
-
-			for key in datetime_columns:
-				frame[key] = pandas.to_datetime(frame[key], errors="coerce")
-
-			for (key, type_method) in dtype.items():
-				if (key in frame.columns):
-					match type_method:
-						case "decimal":
-							def formatDecimal(value):
-								if (value is None):
-									return None
-
-								if (isinstance(value, (int, decimal.Decimal))):
-									return value
-
-								if (isinstance(value, float)):
-									return decimal.Decimal(value)
-
-								if (isinstance(value, str)):
-									if (not value):
-										return None
+			frame = parseFrame(handle_binary, destination, **parseKwargs)
+			profiler.mark("parse", frame, item=destination)
+
+			if (frame.empty):
+				if (yieldEmpty):
+					yield formatReturn(frame, _info, destination)
+				continue
+
+			if (modifyData_pre):
+				logging.info("Modifying input data...")
+				for myFunction in PyUtilities.common.ensure_container(modifyData_pre):
+					if (myFunction is not None):
+						response = myFunction(frame)
+						if (response is not None):
+							frame = response
+				profiler.mark("modifyData_pre", frame)
+
+			if (last_modifier and ("last_modifier" not in frame.columns)):
+				frame["last_modifier"] = last_modifier
+
+			if (alias):
+				logging.info("Applying alias to data...")
+				frame.rename(alias, axis=1, inplace=True)
+				profiler.mark("alias", frame)
+
+			if (no_duplicates):
+				# TODO: https://stackoverflow.com/questions/20625582/how-to-deal-with-settingwithcopywarning-in-pandas/53954986#53954986
+				logging.info("Removing duplicate rows...")
+				frame.drop_duplicates(subset=list(PyUtilities.common.ensure_container(no_duplicates)), inplace=True)
+				profiler.mark("no_duplicates", frame)
+
+			if (len(dtype.keys()) or len(datetime_columns)):
+				logging.info("Converting data types...")
+				convertKwargs = {"dtype": dtype, "datetime_columns": datetime_columns, "int_columns_list": int_columns_list, "int_columns_null": int_columns_null,
+					"onError_decimal": onError_decimal, "onError_int": onError_int}
+
+				if (transform_workers):
+					frame = applyParallel(frame, functools.partial(convertTypes, **convertKwargs), workers=transform_workers, executor=transform_executor)
+				else:
+					frame = convertTypes(frame, **convertKwargs)
 
+				profiler.mark("typeCatalogue", frame)
+
+			if (filterData_pre):
+				logging.info("Filtering input data...")
+				for myFunction in PyUtilities.common.ensure_container(filterData_pre):
+					if (myFunction is not None):
+						frame = frame[myFunction(frame)].copy(deep=True)
+				profiler.mark("filterData_pre", frame)
+
+				if (frame.empty):
+					logging.info("Filtered data is now empty")
+					if (yieldEmpty):
+						yield formatReturn(frame, _info, destination)
+					continue
+
+			if (string_index):
+				logging.info("Referencing String Index Columns...")
+				for key in PyUtilities.datasource.postgres.apply_stringIndex(frame, string_index, string_index__keepValue=string_index__keepValue, connection=connection):
+					int_columns[key] = True
+					etc_skip.add(key)
+				profiler.mark("string_index", frame)
+
+			if (foreign):
+				logging.info("Migrating Foreign Columns...")
+				for foreignKwargs in PyUtilities.common.ensure_container(foreign):
+					for key in PyUtilities.datasource.postgres.apply_foreign(frame, **foreignKwargs, connection=connection):
+						int_columns[key] = True
+						etc_skip.add(key)
+				profiler.mark("foreign", frame)
+
+			if (move):
+				logging.info("Moving Columns...")
+				for moveKwargs in PyUtilities.common.ensure_container(move):
+					PyUtilities.datasource.postgres.apply_foreign(frame, insert_fk=True, **moveKwargs, connection=connection)
+				profiler.mark("move", frame)
+
+			if (replace_nan):
+				for key in int_columns.keys():
+					if ((key in frame.columns) and (key not in int_columns_null)):
+						frame.fillna({key: 0}, inplace=True)
+
+				# for key in datetime_columns:
+				# 	if (key in frame.columns):
+				# 		frame.fillna({key: datetime.datetime(1800,1,1)}, inplace=True)
+
+				frame.fillna(numpy.nan, inplace=True)
+				frame.replace({numpy.nan: None}, inplace=True)
+				profiler.mark("replace_nan", frame)
+
+			if (remove):
+				logging.info("Removing Columns...")
+
+				remove_keys = set()
+				remove_functions = []
+				for key in PyUtilities.common.ensure_container(remove):
+					if (isinstance(key, str)):
+						if (key in frame.columns):
+							remove_keys.add(key)
+						continue
+
+					if (PyUtilities.common.inspect.ismethod(key) or PyUtilities.common.inspect.isfunction(key)):
+						remove_functions.append(key)
+
+				for myFunction in remove_functions:
+					if (myFunction is not None):
+						remove_keys.update(filter(myFunction, frame.columns))
+
+				if (len(remove_keys)):
+					frame.drop(remove_keys, axis=1, inplace=True)
+				profiler.mark("remove", frame)
+
+			if (remove_allNull):
+				frame.drop(getNullColumns(frame), axis=1, inplace=True)
+				profiler.mark("remove_allNull", frame)
+
+			if (PyUtilities.logger.debugging):
+				with pandas.option_context("display.max_rows", 4, "display.max_columns", None):
+					logging.debug(f"\n{frame}")
+
+			if (filterData):
+				logging.info("Filtering data...")
+				for myFunction in PyUtilities.common.ensure_container(filterData):
+					if (myFunction is not None):
+						frame = frame[myFunction(frame)].copy(deep=True)
+				profiler.mark("filterData", frame)
+
+				if (frame.empty):
+					logging.info("Filtered data is now empty")
+					if (yieldEmpty):
+						yield formatReturn(frame, _info, destination)
+					continue
+
+			if (sort_by):
+				logging.info("Sorting Pre Modified data...")
+				frame.sort_values(by=sort_by, axis=0, inplace=True, ascending=True, na_position="last", **(sortByKwargs or {}))
+				frame = frame.reset_index(drop=True)
+				profiler.mark("sort_by", frame)
+
+			if (etc):
+				logging.info("Moving columns into an etc column...")
+				apply_etc(frame, etc, alias=alias, etc_skip=etc_skip)
+				profiler.mark("etc", frame)
+
+			if (modifyData):
+				logging.info("Modifying data...")
+				for myFunction in PyUtilities.common.ensure_container(modifyData):
+					if (myFunction is not None):
+						response = myFunction(frame)
+						if (response is not None):
+							frame = response
+				profiler.mark("modifyData", frame)
+
+			if (etc_post):
+				logging.info("Moving modified columns into an etc column...")
+				apply_etc(frame, etc_post, alias=alias, etc_skip=etc_skip)
+				profiler.mark("etc_post", frame)
+
+			if (sort_by_post):
+				logging.info("Sorting Post Modified data...")
+				frame.sort_values(by=sort_by_post, axis=1, inplace=True, ascending=True, na_position="last", **(sortByPostKwargs or {}))
+				frame = frame.reset_index(drop=True)
+				profiler.mark("sort_by_post", frame)
+
+			if (filterData_post):
+				logging.info("Filtering output data...")
+				for myFunction in PyUtilities.common.ensure_container(filterData):
+					if (myFunction is not None):
+						frame = frame[myFunction(frame)].copy(deep=True)
+				profiler.mark("filterData_post", frame)
+
+				if (frame.empty):
+					logging.info("Filtered data is now empty")
+					if (yieldEmpty):
+						yield formatReturn(frame, _info, destination)
+					continue
+
+			yield formatReturn(frame, _info, destination)
+
+	if (profile and (profiler is not profile)):
+		profiler.log()
+		if (isinstance(profile, str)):
+			profiler.save(profile)
+
+	if ((not found) and (not can_findNone)):
+		raise ValueError("No files were found")
+
+def convertTypes(frame, dtype=None, datetime_columns=(), *, int_columns_list=(), int_columns_null=(), onError_decimal=None, onError_int=None):
+	""" Converts the columns of *frame* to the types *yield_frame* was asked for.
+	This is a module level function so it can be sent to a process pool (see *applyParallel*).
+
+	dtype (dict) - What to convert each column to; where the key is the column name and the value is one of: decimal, bool, Int64, str
+	datetime_columns (list) - Which columns to convert to datetimes
+	int_columns_list (list) - Which Int64 columns hold comma separated lists, where only the first value should be kept
+	int_columns_null (list) - Which Int64 columns can be null instead of 0
+	onError_decimal (function) - What to do with a value that cannot be made into a decimal
+	onError_int (function) - What to do with a value that cannot be made into an int
+
+	Example Input: convertTypes(frame, {"lorem": "decimal", "ipsum": "Int64"})
+	Example Input: convertTypes(frame, datetime_columns=("lorem",))
+	"""
+
+	for key in datetime_columns:
+		frame[key] = pandas.to_datetime(frame[key], errors="coerce")
+
+	for (key, type_method) in (dtype or {}).items():
+		if (key in frame.columns):
+			match type_method:
+				case "decimal":
+					def formatDecimal(value):
+						if (value is None):
+							return None
+
+						if (isinstance(value, (int, decimal.Decimal))):
+							return value
+
+						if (isinstance(value, float)):
+							return decimal.Decimal(value)
+
+						if (isinstance(value, str)):
+							if (not value):
+								return None
+
+							try:
+								if ("%" in value):
+									value = value.replace("%", "").replace(",", "").strip()
+									value = f"{float(value) / 100:.2f}"
+								else:
+									value = value.replace(",", "").strip()
+
+								return decimal.Decimal(value)
+							except (decimal.InvalidOperation, ValueError) :
+								if (onError_decimal):
 									try:
-										if ("%" in value):
-											value = value.replace("%", "").replace(",", "").strip()
-											value = f"{float(value) / 100:.2f}"
-										else:
-											value = value.replace(",", "").strip()
+										return formatDecimal(onError_decimal(value))
+									except Exception as error:
+										logging.info(f"*onError_decimal* failed while formatting a decimal on '{key}': '{value}'; {error}")
+										raise error
 
-										return decimal.Decimal(value)
-									except (decimal.InvalidOperation, ValueError) :
-										if (onError_decimal):
-											try:
-												return formatDecimal(onError_decimal(value))
-											except Exception as error:
-												logging.info(f"*onError_decimal* failed while formatting a decimal on '{key}': '{value}'; {error}")
-												raise error
+								logging.info(f"Invalid decimal format on '{key}': '{value}'")
+								return None
 
-										logging.info(f"Invalid decimal format on '{key}': '{value}'")
-										return None
+						raise NotImplementedError(f"Unknown type conversion: '{type(value)}' to decimal", {"value": value})
 
-								raise NotImplementedError(f"Unknown type conversion: '{type(value)}' to decimal", {"value": value})
+					############################
 
-							############################
+					frame[key] = frame[key].map(formatDecimal)
 
-							frame[key] = frame[key].map(formatDecimal)
+				case "bool":
+					def formatBool(value):
+						if (value is None):
+							return None
 
-						case "bool":
-							def formatBool(value):
-								if (value is None):
-									return None
+						if (isinstance(value, bool)):
+							return value
 
-								if (isinstance(value, bool)):
-									return value
+						if (isinstance(value, int)):
+							return bool(value)
 
-								if (isinstance(value, int)):
-									return bool(value)
+						if (isinstance(value, str)):
+							if (not value):
+								return None
 
-								if (isinstance(value, str)):
-									if (not value):
-										return None
+							if (value.isnumeric()):
+								return value != "0"
 
-									if (value.isnumeric()):
-										return value != "0"
+							match value.strip().lower():
+								case "yes" | "y" | "on" | "true" | "t":
+									return True
 
-									match value.strip().lower():
-										case "yes" | "y" | "on" | "true" | "t":
-											return True
+								case "no" | "n" | "off" | "false" | "f":
+									return False
 
-										case "no" | "n" | "off" | "false" | "f":
-											return False
+								case _:
+									raise NotImplementedError(f"Unknown boolean format: '{value.lower()}' for '{key}")
 
-										case _:
-											raise NotImplementedError(f"Unknown boolean format: '{value.lower()}' for '{key}")
 
+						raise NotImplementedError(f"Unknown type conversion: '{type(value)}' to bool", {"value": value})
 
-								raise NotImplementedError(f"Unknown type conversion: '{type(value)}' to bool", {"value": value})
+					############################
 
-							############################
+					frame[key] = frame[key].map(formatBool).astype(bool)
 
-							frame[key] = frame[key].map(formatBool).astype(bool)
+				case "Int64":
+					def formatInt(value):
 
-						case "Int64":
-							def formatInt(value):
+						if ((value is None) or (value == "")):
+							return None
 
-								if ((value is None) or (value == "")):
-									return None
+						if (isinstance(value, int)):
+							return value
 
-								if (isinstance(value, int)):
-									return value
+						# Remove any commas
+						if (isinstance(value, str)):
+							value = value.replace(",", "")
 
-								# Remove any commas
-								if (isinstance(value, str)):
-									value = value.replace(",", "")
+						# Account for floats
+						if (isinstance(value, (str, float))):
+							if (isinstance(value, float) and numpy.isnan(value)):
+								return None
 
-								# Account for floats
-								if (isinstance(value, (str, float))):
-									if (isinstance(value, float) and numpy.isnan(value)):
-										return None
+							try:
+								value = int(float(value))
+							except ValueError:
+								if (onError_int):
+									return formatInt(onError_int(value))
 
-									try:
-										value = int(float(value))
-									except ValueError:
-										if (onError_int):
-											return formatInt(onError_int(value))
+								logging.info(f"Invalid int format on '{key}': '{value}'")
+								return None
 
-										logging.info(f"Invalid int format on '{key}': '{value}'")
-										return None
+						return value
 
-								return value
+					############################
 
-							############################
+					if (key in int_columns_list):
+						frame[key] = frame[key].astype(str).str.split(",").str[0]
+						frame.loc[frame[key] == "nan", key] = 0
 
-							if (key in int_columns_list):
-								frame[key] = frame[key].astype(str).str.split(",").str[0]
-								frame.loc[frame[key] == "nan", key] = 0
+					frame[key] = frame[key].map(formatInt)
+					if (key not in int_columns_null):
+						frame[key] = frame[key].fillna(0) # Do not truncate "int64" to "int32"
+					
+					if (frame[key].dtype == "float64"):
+						frame[key] = frame[key].astype(str).str.split(".").str[0] # Fixes cannot safely cast non-equivalent float64 to int64
 
-							frame[key] = frame[key].map(formatInt)
-							if (key not in int_columns_null):
-								frame[key] = frame[key].fillna(0) # Do not truncate "int64" to "int32"
-							
-							if (frame[key].dtype == "float64"):
-								frame[key] = frame[key].astype(str).str.split(".").str[0] # Fixes cannot safely cast non-equivalent float64 to int64
+					frame[key] = frame[key].astype("Int64")
 
-							frame[key] = frame[key].astype("Int64")
+				case "str":
+					# See: https://bobbyhadz.com/blog/python-remove-xa0-from-string#remove-xa0-from-a-string-in-python
+					frame[key] = frame[key].replace({numpy.nan: None})
+					frame[key] = frame[key].astype(str).str.normalize("NFKC")
+					frame[key] = frame[key].replace({"None": None})
 
-						case "str":
-							# See: https://bobbyhadz.com/blog/python-remove-xa0-from-string#remove-xa0-from-a-string-in-python
-							frame[key] = frame[key].replace({numpy.nan: None})
-							frame[key] = frame[key].astype(str).str.normalize("NFKC")
-							frame[key] = frame[key].replace({"None": None})
+				case _:
+					frame[key] = frame[key].astype(type_method)
 
-						case _:
-							frame[key] = frame[key].astype(value)
+	return frame
 
-		if (filterData_pre):
-			logging.info("Filtering input data...")
-			for myFunction in PyUtilities.common.ensure_container(filterData_pre):
-				if (myFunction is not None):
-					frame = frame[myFunction(frame)].copy(deep=True)
+def is_arrowColumn(dtype):
+	""" Returns if a column of type *dtype* comes back from Arrow exactly as it went in.
+	Only numbers, bools, datetimes and timedeltas are trusted; object and string columns can change (such as None becoming NaN).
 
-			if (frame.empty):
-				logging.info("Filtered data is now empty")
-				if (yieldEmpty):
-					yield formatReturn(frame, _info, destination)
-				continue
+	Example Input: is_arrowColumn(frame["lorem"].dtype)
+	"""
 
-		if (string_index):
-			logging.info("Referencing String Index Columns...")
-			for key in PyUtilities.datasource.postgres.apply_stringIndex(frame, string_index, string_index__keepValue=string_index__keepValue, connection=connection):
-				int_columns[key] = True
-				etc_skip.add(key)
+	return (dtype.kind in "biufmM") and (not isinstance(dtype, pandas.SparseDtype))
 
-		if (foreign):
-			logging.info("Migrating Foreign Columns...")
-			for foreignKwargs in PyUtilities.common.ensure_container(foreign):
-				for key in PyUtilities.datasource.postgres.apply_foreign(frame, **foreignKwargs, connection=connection):
-					int_columns[key] = True
-					etc_skip.add(key)
+def packFrame(frame):
+	""" Returns *frame* in a form that is cheap to send to another process.
+	Columns Arrow can store exactly are written as one Arrow IPC stream; the rest are pickled as they are.
+	See: https://arrow.apache.org/docs/python/ipc.html
 
-		if (move):
-			logging.info("Moving Columns...")
-			for moveKwargs in PyUtilities.common.ensure_container(move):
-				PyUtilities.datasource.postgres.apply_foreign(frame, insert_fk=True, **moveKwargs, connection=connection)
+	Example Input: packFrame(frame)
+	"""
 
-		if (replace_nan):
-			for key in int_columns.keys():
-				if ((key in frame.columns) and (key not in int_columns_null)):
-					frame.fillna({key: 0}, inplace=True)
+	columnList = [key for (key, dtype) in frame.dtypes.items() if is_arrowColumn(dtype)]
+	if ((not columnList) or (not frame.columns.is_unique)):
+		return (None, None, frame)
 
-			# for key in datetime_columns:
-			# 	if (key in frame.columns):
-			# 		frame.fillna({key: datetime.datetime(1800,1,1)}, inplace=True)
+	try:
+		table = pyarrow.Table.from_pandas(frame[columnList], preserve_index=False)
+	except (pyarrow.ArrowException, ValueError, TypeError):
+		return (None, None, frame)
 
-			frame.fillna(numpy.nan, inplace=True)
-			frame.replace({numpy.nan: None}, inplace=True)
+	sink = pyarrow.BufferOutputStream()
+	with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+		writer.write_table(table)
 
-		if (remove):
-			logging.info("Removing Columns...")
+	return (sink.getvalue(), frame.columns, frame.drop(columns=columnList))
 
-			remove_keys = set()
-			remove_functions = []
-			for key in PyUtilities.common.ensure_container(remove):
-				if (isinstance(key, str)):
-					if (key in frame.columns):
-						remove_keys.add(key)
-					continue
+def unpackFrame(package):
+	""" Returns the frame *packFrame* packed.
 
-				if (PyUtilities.common.inspect.ismethod(key) or PyUtilities.common.inspect.isfunction(key)):
-					remove_functions.append(key)
+	Example Input: unpackFrame(packFrame(frame))
+	"""
 
-			for myFunction in remove_functions:
-				if (myFunction is not None):
-					remove_keys.update(filter(myFunction, frame.columns))
+	(buffer, columns, frame) = package
+	if (buffer is None):
+		return frame
 
-			if (len(remove_keys)):
-				frame.drop(remove_keys, axis=1, inplace=True)
+	with pyarrow.ipc.open_stream(buffer) as reader:
+		frame_arrow = reader.read_all().to_pandas()
 
-		if (remove_allNull):
-			frame.drop(getNullColumns(frame), axis=1, inplace=True)
+	# Arrow turns column names into strings, so put back the real ones
+	frame_arrow.columns = [key for key in columns if (key not in frame.columns)]
+	frame_arrow.index = frame.index
 
-		if (True or PyUtilities.logger.debugging):
-			with pandas.option_context("display.max_rows", 4, "display.max_columns", None):
-				logging.debug(f"\n{frame}")
+	return pandas.concat((frame_arrow, frame), axis=1)[columns]
 
-		if (filterData):
-			logging.info("Filtering data...")
-			for myFunction in PyUtilities.common.ensure_container(filterData):
-				if (myFunction is not None):
-					frame = frame[myFunction(frame)].copy(deep=True)
+def applyPartition(myFunction, package):
+	""" Runs *myFunction* on a frame packed with *packFrame* and returns the packed answer.
+	Used by *applyParallel* in the worker processes.
+	"""
 
-			if (frame.empty):
-				logging.info("Filtered data is now empty")
-				if (yieldEmpty):
-					yield formatReturn(frame, _info, destination)
-				continue
+	frame = unpackFrame(package)
+	answer = myFunction(frame)
+	return packFrame(frame if (answer is None) else answer)
+
+def applyParallel(frame, myFunction, *, workers=None, partition_count=None, min_rows=10000, executor=None):
+	""" Returns the answer of *myFunction* on *frame*, after splitting *frame* into row partitions and running them in a process pool.
+	Partitions are sent to and from the workers with *packFrame*, and stitched back together in order.
+	Only use this for work that looks at each row on its own.
+
+	myFunction (function) - What to run on each partition; must be picklable (such as a module level function or a functools.partial of one)
+		- If it returns None: The partition it was given is used, so functions that change the frame in place also work
+	workers (int) - How many processes to use
+		- If None: Will use the number of CPUs
+	partition_count (int) - How many partitions to split *frame* into
+		- If None: Will use *workers*
+	min_rows (int) - Frames with fewer rows than this are run in this process, since starting the pool would cost more than it saves
+	executor (concurrent.futures.Executor) - An existing pool to use
+
+	Example Input: applyParallel(frame, functools.partial(convertTypes, dtype={"lorem": "decimal"}))
+	Example Input: applyParallel(frame, lorem, workers=8)
+	Example Input: yield_frame(data, modifyData=functools.partial(applyParallel, myFunction=lorem))
+	"""
 
-		if (sort_by):
-			logging.info("Sorting Pre Modified data...")
-			frame.sort_values(by=sort_by, axis=0, inplace=True, ascending=True, na_position="last", **(sortByKwargs or {}))
-			frame = frame.reset_index(drop=True)
-
-		if (etc):
-			logging.info("Moving columns into an etc column...")
-			apply_etc(frame, etc, alias=alias, etc_skip=etc_skip)
-
-		if (modifyData):
-			logging.info("Modifying data...")
-			for myFunction in PyUtilities.common.ensure_container(modifyData):
-				if (myFunction is not None):
-					response = myFunction(frame)
-					if (response is not None):
-						frame = response
-
-		if (etc_post):
-			logging.info("Moving modified columns into an etc column...")
-			apply_etc(frame, etc_post, alias=alias, etc_skip=etc_skip)
-
-		if (sort_by_post):
-			logging.info("Sorting Post Modified data...")
-			frame.sort_values(by=sort_by_post, axis=1, inplace=True, ascending=True, na_position="last", **(sortByPostKwargs or {}))
-			frame = frame.reset_index(drop=True)
-
-		if (filterData_post):
-			logging.info("Filtering output data...")
-			for myFunction in PyUtilities.common.ensure_container(filterData):
-				if (myFunction is not None):
-					frame = frame[myFunction(frame)].copy(deep=True)
+	workers = workers or os.cpu_count() or 1
+	if ((len(frame.index) < min_rows) or ((workers <= 1) and (executor is None))):
+		answer = myFunction(frame)
+		return frame if (answer is None) else answer
 
-			if (frame.empty):
-				logging.info("Filtered data is now empty")
-				if (yieldEmpty):
-					yield formatReturn(frame, _info, destination)
-				continue
+	partition_count = max(min(partition_count or workers, len(frame.index)), 1)
+	boundaryList = numpy.linspace(0, len(frame.index), partition_count + 1, dtype=int)
+	packageList = [packFrame(frame.iloc[start:end]) for (start, end) in zip(boundaryList[:-1], boundaryList[1:])]
 
-		yield formatReturn(frame, _info, destination)
+	with (contextlib.nullcontext(executor) if executor else concurrent.futures.ProcessPoolExecutor(max_workers=workers)) as _executor:
+		answerList = [unpackFrame(package) for package in _executor.map(applyPartition, itertools.repeat(myFunction), packageList)]
 
-	if ((not found) and (not can_findNone)):
-		raise ValueError("No files were found")
+	return pandas.concat(answerList)
 
 def apply_etc(frame, container, *, alias=None, etc_skip=None, **kwargs):
 	""" Moves the given columns into an etc column.
@@ -740,9 +1559,11 @@ def getUnique(data, column, *, as_list=True):
 	"""
 
 	columnList = list(PyUtilities.common.ensure_container(column))
+	frameList = PyUtilities.common.ensure_container(data, checkIteratorFunction=lambda item: not isinstance(item, pandas.DataFrame))
 
-	data_str = pandas.concat(tuple(item[columnList].copy() for item in PyUtilities.common.ensure_container(data, checkIteratorFunction=lambda item: not isinstance(item, pandas.DataFrame))), ignore_index=True)
-	data_unique = pandas.concat(data_str[key].drop_duplicates() for key in columnList).drop_duplicates().dropna()
+	# Concatenate once instead of building intermediate frames
+	data_all = pandas.concat(tuple(item[key] for key in columnList for item in frameList), ignore_index=True).dropna()
+	data_unique = data_all[~getDuplicateMask(data_all)].reset_index(drop=True)
 	
 	if (as_list):
 		return data_unique.tolist()
@@ -752,6 +1573,141 @@ def getUnique(data, column, *, as_list=True):
 
 	return frame
 
+def getDuplicateMask(data, subset=None, *, keep="first"):
+	""" Returns a boolean series for which rows of *data* are duplicates, the same as *data.duplicated()*.
+	The key columns are hashed once and only rows that share a hash are compared by value, so data with few duplicates costs about one pass.
+	See: https://pandas.pydata.org/docs/reference/api/pandas.util.hash_pandas_object.html
+
+	data (DataFrame or Series) - What to check
+	subset (str or list) - Which column(s) make up the key for a frame
+		- If None: Will use all columns
+	keep (str or bool) - Which duplicates to not mark (see *pandas.DataFrame.duplicated*)
+
+	Example Input: getDuplicateMask(frame, "property_id")
+	Example Input: getDuplicateMask(frame, ("property_id", "unit_id"), keep=False)
+	Example Input: getDuplicateMask(series)
+	"""
+
+	if (isinstance(data, pandas.DataFrame) and (subset is not None)):
+		data = data[list(PyUtilities.common.ensure_container(subset))]
+
+	hashes = pandas.util.hash_pandas_object(data, index=False)
+	mask_candidate = hashes.duplicated(keep=False)
+
+	mask = pandas.Series(False, index=data.index)
+	if (not mask_candidate.any()):
+		return mask
+
+	# Different values can share a hash (such as 1 and "1"), so compare the actual values of the candidates
+	data_candidate = data[mask_candidate.to_numpy()]
+	mask[mask_candidate.to_numpy()] = data_candidate.duplicated(keep=keep).to_numpy()
+
+	return mask
+
+frameSnapshot_folder = os.path.join(os.path.expanduser("~"), "PyUtilities_snapshot")
+
+def getRowHash(frame, columns=None):
+	""" Returns a uint64 series with a hash of the values in each row of *frame*.
+	Columns are hashed in name order, so the same data gives the same hash no matter how the columns are ordered.
+
+	columns (list) - Which columns to hash
+		- If None: Will use all columns
+
+	Example Input: getRowHash(frame)
+	Example Input: getRowHash(frame, ("lorem", "ipsum"))
+	"""
+
+	columns = sorted(PyUtilities.common.ensure_container(columns) if (columns is not None) else frame.columns, key=str)
+	return pandas.util.hash_pandas_object(frame[columns], index=False)
+
+def getSnapshotPath(name, snapshot_folder=None):
+	""" Returns where the snapshot for *name* is stored.
+
+	Example Input: getSnapshotPath("rentManager.unit")
+	"""
+
+	filename = re.sub(r"[^\w.-]", "_", name)
+	return os.path.join(snapshot_folder or frameSnapshot_folder, f"{filename}.parquet")
+
+def diffSnapshot(frame, name, key, *, columns=None, snapshot_folder=None):
+	""" Compares *frame* to the last saved snapshot for *name* to find which rows were added, changed, or removed.
+	Each row is reduced to a hash keyed by its primary key, so only the keys and hashes of the last snapshot are kept on disk.
+	Returns a dictionary with the keys:
+		- insert: Rows in *frame* that are not in the snapshot
+		- update: Rows in *frame* whose values are different from the snapshot
+		- delete: The keys of rows in the snapshot that are not in *frame*
+		- snapshot: What to give *saveSnapshot* once the changes have been applied
+
+	frame (DataFrame) - The full current data
+	name (str) - What the snapshot is called; use one name per source and table
+	key (str or list) - Which column(s) make up the primary key
+	columns (list) - Which columns to look at for changes
+		- If None: Will use all columns that are not in *key*
+	snapshot_folder (str) - Where snapshots are stored
+		- If None: Will use *frameSnapshot_folder*
+
+	Example Input: diffSnapshot(frame, "rentManager.unit", "unit_id")
+	Example Input: diffSnapshot(frame, "showMojo.listing", ("listing_id", "date"), columns=("price", "status"))
+	"""
+
+	key = list(PyUtilities.common.ensure_container(key))
+	if (not key):
+		raise ValueError(f"Missing key column(s) for snapshot '{name}'")
+
+	missing = [item for item in key if (item not in frame.columns)]
+	if (missing):
+		raise KeyError(f"Missing key column(s) {missing} for snapshot '{name}'")
+
+	frame = frame.reset_index(drop=True)
+	if (getDuplicateMask(frame, key).any()):
+		raise ValueError(f"Key column(s) {key} are not unique for snapshot '{name}'")
+
+	snapshot = frame[key].copy()
+	snapshot["__hash"] = getRowHash(frame, columns if (columns is not None) else [item for item in frame.columns if (item not in key)]).to_numpy()
+
+	try:
+		snapshot_old = pandas.read_parquet(getSnapshotPath(name, snapshot_folder))
+	except FileNotFoundError:
+		logging.info(f"No snapshot found for '{name}'; all {len(frame.index)} rows are new")
+		return {"insert": frame, "update": frame.iloc[0:0], "delete": frame[key].iloc[0:0], "snapshot": snapshot}
+
+	index_new = pandas.MultiIndex.from_frame(snapshot[key])
+	index_old = pandas.MultiIndex.from_frame(snapshot_old[key])
+
+	position = index_old.get_indexer(index_new)
+	mask_insert = (position == -1)
+	mask_update = (~mask_insert) & (snapshot_old["__hash"].to_numpy()[position] != snapshot["__hash"].to_numpy())
+	mask_delete = ~index_old.isin(index_new)
+
+	answer = {
+		"insert": frame[mask_insert],
+		"update": frame[mask_update],
+		"delete": snapshot_old.loc[mask_delete, key].reset_index(drop=True),
+		"snapshot": snapshot,
+	}
+
+	logging.info(f"Snapshot '{name}' has {len(answer['insert'].index)} new, {len(answer['update'].index)} changed, and {len(answer['delete'].index)} removed rows out of {len(frame.index)}")
+	return answer
+
+def saveSnapshot(name, snapshot, *, snapshot_folder=None):
+	""" Saves what *diffSnapshot* returned as the snapshot for *name*.
+	Call this only after the changes were applied, so a failed load is diffed again next time.
+
+	snapshot (DataFrame or dict) - The 'snapshot' frame, or everything *diffSnapshot* returned
+
+	Example Input: saveSnapshot("rentManager.unit", answer)
+	"""
+
+	if (isinstance(snapshot, dict)):
+		snapshot = snapshot["snapshot"]
+
+	filepath = getSnapshotPath(name, snapshot_folder)
+	os.makedirs(os.path.dirname(filepath), exist_ok=True)
+
+	filepath_temp = f"{filepath}.{os.getpid()}.tmp"
+	snapshot.to_parquet(filepath_temp, index=False)
+	os.replace(filepath_temp, filepath)
+
 def makeEtc(frame, columnList, *, columnName="etc", overwrite=False):
 	""" Moves values from *columnList* in *frame* into a JSON object column
 
@@ -807,13 +1763,18 @@ def yield_duplicates(frame, subset, *, include_first=True):
 	Example Input: yield_duplicates(frame, "property_id", include_first=false)
 	"""
 
+	# Only group the rows that have a duplicate key; most data has none
+	frame_candidate = frame[getDuplicateMask(frame, subset, keep=False).to_numpy()]
+	if (frame_candidate.empty):
+		return
+
 	if (include_first):
-		for (index, frame_grouped) in frame.groupby(subset):
+		for (index, frame_grouped) in frame_candidate.groupby(subset):
 			if (len(frame_grouped) > 1):
 				yield frame_grouped
 		return
 
-	frame_duplicated = frame[frame.duplicated(subset=subset)]
+	frame_duplicated = frame_candidate[frame_candidate.duplicated(subset=subset)]
 	if (not len(frame_duplicated)):
 		return
 
@@ -857,3 +1818,173 @@ def getNullColumns(frame, *, invert=False):
 		return frame.columns[~frame.isnull().all()]
 
 	return frame.columns[frame.isnull().all()]
+
+def benchmark_csvEngine(filepath=None, *, rows=20000, columns=150, **kwargs):
+	""" Compares how long it takes each csv parser to read *filepath*.
+	Returns a dictionary of the best time (in seconds) for each parser.
+
+	filepath (str) - Which csv file to read
+		- If None: Will generate a wide file similar to a vendor export with *rows* rows and *columns* columns
+
+	Example Input: benchmark_csvEngine()
+	Example Input: benchmark_csvEngine("./SyncSource/vineyards/acapdetail.csv")
+	Example Input: benchmark_csvEngine(rows=100000, columns=40, repeat=3)
+	"""
+
+	if (filepath is None):
+		with tempfile.TemporaryDirectory() as folder:
+			_filepath = os.path.join(folder, "benchmark.csv")
+
+			generator = numpy.random.default_rng(0)
+			frame = pandas.DataFrame({
+				f"Column {i}": (
+					generator.integers(0, 1000000, rows),
+					generator.random(rows) * 1000,
+					pandas.Series(generator.integers(0, 500, rows)).map(lambda value: f"Vendor Résumé {value}"),
+					pandas.Series(pandas.Timestamp("2020-01-01") + pandas.to_timedelta(generator.integers(0, 1000, rows), unit="D")).dt.strftime("%m/%d/%Y"),
+				)[i % 4] for i in range(columns)
+			})
+			frame.to_csv(_filepath, index=False, encoding="utf8")
+
+			return benchmark_csvEngine(_filepath, **kwargs)
+
+	return PyUtilities.benchmarking.benchmark({
+		"c (Windows-1252)": lambda: pandas.read_csv(filepath, encoding="Windows-1252"),
+		"c (detected)": lambda: readFrame(filepath),
+		"pyarrow (detected)": lambda: readFrame(filepath, engine="pyarrow"),
+	}, label="csv engine", **kwargs)
+
+class TestCase(PyUtilities.testing.BaseCase):
+	def test_sniffFile_findsExcelAnywhereInZip(self):
+		with tempfile.TemporaryDirectory() as folder:
+			filepath = os.path.join(folder, "lorem.xlsx")
+
+			# Put other entries first, so '[Content_Types].xml' and 'xl/' are not in the first few bytes
+			with zipfile.ZipFile(filepath, "w") as handle_zip:
+				handle_zip.writestr("docProps/app.xml", "x" * 4096)
+				handle_zip.writestr("_rels/.rels", "x" * 4096)
+				handle_zip.writestr("[Content_Types].xml", "")
+				handle_zip.writestr("xl/workbook.xml", "")
+
+			self.assertEqual(sniffFile(filepath)["file_format"], "excel")
+
+			with open(filepath, "rb") as handle:
+				self.assertEqual(sniffFile(handle)["file_format"], "excel")
+				self.assertEqual(handle.tell(), 0)
+
+			pandas.DataFrame({"lorem": [1, 2]}).to_excel(filepath, index=False)
+			self.assertEqual(sniffFile(filepath)["file_format"], "excel")
+
+			filepath_zip = os.path.join(folder, "lorem.zip")
+			with zipfile.ZipFile(filepath_zip, "w") as handle_zip:
+				handle_zip.writestr("lorem.csv", "a,b\n1,2\n")
+
+			self.assertEqual((sniffFile(filepath_zip)["file_format"], sniffFile(filepath_zip)["compression"]), ("csv", "zip"))
+
+	def test_detectDelimiter_keepsCommaWhenAmbiguous(self):
+		sample = b'id,name,note\n1,"Smith; John","a|b; c"\n2,"Doe; Jane","d|e; f"\n3,"Roe; Rick","g|h; i"\n'
+		self.assertEqual(detectDelimiter(sample), ",")
+
+		with tempfile.TemporaryDirectory() as folder:
+			filepath = os.path.join(folder, "lorem.csv")
+			with open(filepath, "wb") as handle:
+				handle.write(sample)
+
+			frame = parseFrame(filepath)
+			self.assertEqual(list(frame.columns), ["id", "name", "note"])
+			self.assertEqual(frame["name"].tolist(), ["Smith; John", "Doe; Jane", "Roe; Rick"])
+
+	def test_detectDelimiter_usesUnambiguousGuess(self):
+		sample = b"id;name;amount\n1;Smith;1,5\n2;Doe;2,25\n3;Roe;3\n"
+		self.assertEqual(detectDelimiter(sample), ";")
+
+		with tempfile.TemporaryDirectory() as folder:
+			filepath = os.path.join(folder, "lorem.csv")
+			with open(filepath, "wb") as handle:
+				handle.write(sample)
+
+			self.assertEqual(list(parseFrame(filepath).columns), ["id", "name", "amount"])
+
+			# A given delimiter is always used
+			self.assertEqual(list(parseFrame(filepath, delimiter=",").columns), ["id;name;amount"])
+
+	def test_readFrame_excelMatchesReadExcel(self):
+		workbook = openpyxl.Workbook()
+		worksheet = workbook.active
+		worksheet.append(["id", "amount", "date", "flag", "name", None, "id"])
+		for i in range(1, 301):
+			if (i in (5, 6)):
+				worksheet.append([]) # Blank rows in the middle are kept
+				continue
+
+			worksheet.append([i, 1.5 if (i % 2) else 2.0, datetime.datetime(2020, 1, 1) + datetime.timedelta(days=i), bool(i % 3), f"lorem {i}" if (i % 7) else None, None, "ipsum" if (i == 250) else i])
+		worksheet.append([])
+		worksheet.append([])
+
+		with tempfile.TemporaryDirectory() as folder:
+			filepath = os.path.join(folder, "lorem.xlsx")
+			workbook.save(filepath)
+
+			pandas.testing.assert_frame_equal(readFrame(filepath, file_format="excel"), pandas.read_excel(filepath))
+			pandas.testing.assert_frame_equal(readFrame(filepath, file_format="excel", columns=["id", "name"]), pandas.read_excel(filepath, usecols=["id", "name"]))
+
+			chunkList = list(yield_excelChunk(filepath, chunk_size=100))
+			self.assertEqual([len(chunk) for chunk in chunkList], [100, 100, 100])
+			pandas.testing.assert_series_equal(pandas.concat(chunkList, ignore_index=True)["name"], pandas.read_excel(filepath)["name"])
+
+	def test_applyParallel_matchesSerial(self):
+		frame = pandas.DataFrame({
+			"amount": pandas.Series([1, None, 3] * 20, dtype=object),
+			"price": ["1,000.50", "12%", "", "d"] * 15,
+			"count": ["1", "2,3", None] * 20,
+			"label": ["lorem", None, 1.5] * 20,
+			"date": ["2020-01-31", None, "lorem"] * 20,
+			"score": [1.5, numpy.nan, 3.0] * 20,
+		})
+		myFunction = functools.partial(convertTypes, dtype={"amount": "decimal", "price": "decimal", "count": "Int64", "label": "str"},
+			datetime_columns=("date",), int_columns_list=("count",), int_columns_null=("count",))
+
+		answer_serial = convertTypes(frame.copy(), **myFunction.keywords)
+		answer_parallel = applyParallel(frame.copy(), myFunction, workers=2, partition_count=3, min_rows=0)
+
+		pandas.testing.assert_frame_equal(answer_parallel, answer_serial)
+		self.assertEqual([type(value) for value in answer_parallel["amount"]], [type(value) for value in answer_serial["amount"]])
+
+	def test_packFrame_keepsObjectColumns(self):
+		frame = pandas.DataFrame({
+			0: [1, 2, 3],
+			"count": pandas.array([1, None, 3], dtype="Int64"),
+			"date": pandas.to_datetime(["2020-01-01", None, "2021-01-01"]),
+			"amount": [decimal.Decimal("1.10"), None, decimal.Decimal("3")],
+			"label": ["lorem", None, 1.5],
+		}, index=[4, 4, 5])
+
+		package = packFrame(frame)
+		self.assertIsNotNone(package[0])
+		self.assertEqual(list(package[2].columns), ["amount", "label"])
+
+		answer = unpackFrame(package)
+		pandas.testing.assert_frame_equal(answer, frame)
+		self.assertEqual(answer["amount"].tolist(), frame["amount"].tolist())
+
+	def test_diffSnapshot_findsChangedRows(self):
+		with tempfile.TemporaryDirectory() as folder:
+			frame = pandas.DataFrame({"unit_id": [1, 2, 3], "name": ["a", "b", "c"], "price": [1.5, 2.5, None]})
+			answer = diffSnapshot(frame, "lorem", "unit_id", snapshot_folder=folder)
+			self.assertEqual(len(answer["insert"].index), 3)
+			saveSnapshot("lorem", answer, snapshot_folder=folder)
+
+			frame = pandas.DataFrame({"unit_id": [1, 2, 4], "name": ["a", "b", "d"], "price": [1.5, 3.5, None]})
+			answer = diffSnapshot(frame, "lorem", "unit_id", snapshot_folder=folder)
+			self.assertEqual(answer["insert"]["unit_id"].tolist(), [4])
+			self.assertEqual(answer["update"]["unit_id"].tolist(), [2])
+			self.assertEqual(answer["delete"]["unit_id"].tolist(), [3])
+
+			with self.assertRaises(ValueError):
+				diffSnapshot(pandas.concat((frame, frame)), "lorem", "unit_id", snapshot_folder=folder)
+
+			with self.assertRaises(ValueError):
+				diffSnapshot(frame, "lorem", None, snapshot_folder=folder)
+
+if (__name__ == "__main__"):
+	PyUtilities.testing.test(TestCase)
@@ -2,11 +2,12 @@ import os
 import sys
 import logging
 
-import pymsteams
-
 import PyUtilities.common
+import PyUtilities.lazyLoad
 from PyUtilities.datasource.common import config
 
+pymsteams = PyUtilities.lazyLoad.load("pymsteams")
+
 def insert(data, *, webhook=None, configKwargs=None, severity=None, title=None, **kwargs):
 	""" Posts a message on MS Teams.
 	See: https://pypi.org/project/pymsteams/
@@ -5,12 +5,13 @@ import sys
 import logging
 import contextlib
 
-import pyodbc
-
 import PyUtilities.common
+import PyUtilities.lazyLoad
 import PyUtilities.logger
 from PyUtilities.datasource.common import config
 
+pyodbc = PyUtilities.lazyLoad.load("pyodbc")
+
 @contextlib.contextmanager
 def getConnection(*, _self=None, connection=None, configKwargs=None, driver="NetSuite Drivers 64bit",
 	host=None, dbname=None, user=None, password=None, account=None, **kwargs):
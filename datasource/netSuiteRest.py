@@ -2,15 +2,15 @@ import os
 import re
 import sys
 import logging
-import functools
 import contextlib
 import urllib.parse
 
-import netsuite
-
 import PyUtilities.common
+import PyUtilities.lazyLoad
 from PyUtilities.datasource.common import config
 
+netsuite = PyUtilities.lazyLoad.load("netsuite")
+
 @contextlib.contextmanager
 def getConnection(*args, connection=None, **kwargs):
 	""" Retuns an object to use for connecting to NetSuite using REST.
@@ -314,7 +314,7 @@ class NetSuiteConnection_REST():
 						if (limit and (count_yielded >= limit)):
 							return
 
-	@functools.lru_cache(maxsize=128)
+	@PyUtilities.common.memoize(maxsize=128, key=lambda self, *args, **kwargs: (self.login_account, args, kwargs))
 	def _makeQuery(self, sql_raw, *, limit=100, offset=0, **kwargs):
 		""" Sends a SuiteQL query to NetSuite.
 		See: https://youtu.be/QM0wDvvrcaM?t=931
@@ -326,7 +326,7 @@ class NetSuiteConnection_REST():
 
 		return PyUtilities.common.syncRunAsync(self.connection_ns.rest_api.suiteql(q=sql_raw, limit=limit, offset=offset))
 
-	@functools.lru_cache(maxsize=128)
+	@PyUtilities.common.memoize(maxsize=128, key=lambda self, *args, **kwargs: (self.login_account, args, kwargs))
 	def _makeRequest(self, endpoint, *, offset=0, **queryKwargs):
 		""" Sends a GET request to NetSuite.
 		Uses caching to prevent lookups that return redundant information
@@ -5,13 +5,16 @@ import urllib
 import logging
 import requests
 
-import msal
 import pandas
-import openpyxl
 
 import PyUtilities.common
+import PyUtilities.lazyLoad
+import PyUtilities.datasource.common
 from PyUtilities.datasource.common import config
 
+msal = PyUtilities.lazyLoad.load("msal")
+openpyxl = PyUtilities.lazyLoad.load("openpyxl")
+
 def getConnection(*args, connection=None, **kwargs):
 	""" Retuns an object to use for connecting to OneDrive.
 
@@ -150,16 +153,16 @@ class OneDriveConnection():
 				logging.warning(f"NOT IMPLEMENTED YET: read videos; filename: '{filename}'")
 				return None
 
-			handle_request = urllib.request.urlopen(url_download)
 			if (output_type == "handle_request"):
-				return handle_request
+				return urllib.request.urlopen(url_download)
 
-			handle_bytes = io.BytesIO(handle_request.read())
+			handle_bytes = PyUtilities.datasource.common.download(url_download)
 			if (output_type == "handle_bytes"):
 				return handle_bytes
 
 			if (".csv" in filename):
-				return pandas.read_csv(url_download)
+				with handle_bytes:
+					return pandas.read_csv(handle_bytes)
 
 			if (".xls" in filename):
 				return openpyxl.load_workbook(handle_bytes)
@@ -233,19 +236,15 @@ class OneDriveConnection():
 
 		url = f"https://graph.microsoft.com/v1.0/{endpoint}"
 		logging.info(f"Sending '{url}' to OneDrive")
-		response = requests.get(url, headers={ "Authorization": f"Bearer {self.token}" })
-
-		if (not endpoint.endswith("/content")):
-			answer = response.json()
-			if ("error" in answer):
-				raise ValueError(answer["error"]["code"], answer["error"])
 
-			return answer
+		if (endpoint.endswith("/content")):
+			return PyUtilities.datasource.common.download(url, headers={ "Authorization": f"Bearer {self.token}" })
 
-		handle_bin = io.BytesIO(response.content)
-		handle_bin.contentType = response.headers['content-type']
+		answer = requests.get(url, headers={ "Authorization": f"Bearer {self.token}" }).json()
+		if ("error" in answer):
+			raise ValueError(answer["error"]["code"], answer["error"])
 
-		return handle_bin
+		return answer
 
 if (__name__ == "__main__"):
 	PyUtilities.logger.logger_info()
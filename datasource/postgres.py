@@ -15,6 +15,7 @@ import psycopg2.extras
 import PyUtilities.common
 import PyUtilities.logger
 import PyUtilities.testing
+import PyUtilities.json_expanded
 import PyUtilities.datasource.common
 import PyUtilities.datasource.general
 from PyUtilities.datasource.common import config
@@ -48,7 +49,7 @@ def _renameKeys(iterable):
 
 def insert(data, table, *, schema=None, method="upsert", insert_method="single", drop_where=None, ignore=None, returning=None,
 	upsert_constraint=None, reset_incrementer=None, lowerNames=False, typeCatalogue=None, configKwargs=None, update_changed=False, replace_nan=True,
-	preInsert=None, postInsert=None, update_set=None, update_where=None, chunk_size=900, backup=None, log_import=None, log_table=True, **kwargs):
+	preInsert=None, postInsert=None, update_set=None, update_where=None, chunk_size=900, backup=None, log_import=None, log_table=True, snapshot=None, **kwargs):
 	""" Adds data to a postgres database.
 	See: https://www.psycopg.org/docs/usage.html#query-parameters
 	Use: http://www.postgresqltutorial.com/postgresql-python/connect/
@@ -81,6 +82,13 @@ def insert(data, table, *, schema=None, method="upsert", insert_method="single",
 	drop_where (str) - What to use for selecting what is dropped
 	update_changed (bool or str) - If only existing items that have been changed should be updated
 		- If str or list of str: Which column(s) to look at for if a change has happened or not
+	snapshot (bool or str or dict) - If *data* is a full snapshot of the source, and only rows that changed since the last successful insert should be sent (see *general.diffSnapshot*)
+		- name: What the snapshot is called; defaults to '{schema}.{table}'
+		- key: Which column(s) make up the primary key; defaults to the columns of *upsert_constraint*
+		- columns: Which columns to look at for changes; defaults to all other columns
+		- delete: If rows that are no longer in *data* should be deleted from the table
+		- folder: Where snapshots are stored
+		- If str: Assumed to be *snapshot.name*
 
 	Example Input: insert([{"lorem": "ipsum"}], "property")
 	Example Input: insert([{"Lorem": "ipsum"}], "property", lowerNames=True)
@@ -99,6 +107,8 @@ def insert(data, table, *, schema=None, method="upsert", insert_method="single",
 	Example Input: insert(frame, "property", method="update", update_where="dolor")
 	Example Input: insert([{"lorem": "ipsum"}], "property", returning="property_id")
 	Example Input: insert([{"lorem": "ipsum"}], "property", returning="property_id as prop_code")
+	Example Input: insert(frame, "unit", snapshot=True)
+	Example Input: insert(frame, "unit", snapshot={"name": "rentManager.unit", "key": "unit_id", "delete": True})
 	"""
 
 	def yield_sqlUpdate(_data, _method):
@@ -307,18 +317,19 @@ def insert(data, table, *, schema=None, method="upsert", insert_method="single",
 
 		if (typeCatalogue):
 			for (key, value) in typeCatalogue.items():
+				if (value == "json"):
+					# Serialize the whole column at once so one encoder is reused for every cell
+					rowList = [row for row in _data if (key in row)]
+					for (row, item) in zip(rowList, PyUtilities.json_expanded.dumpsColumn([row[key] for row in rowList])):
+						row[key] = item
+					continue
+
 				for row in _data:
 					if (key not in row):
 						continue
 
 					item = row[key]
 					match value:
-						case "json":
-							if (isinstance(item, str)):
-								continue
-							
-							row[key] = json.dumps(item)
-
 						case "int":
 							row[key] = int(item)
 
@@ -476,6 +487,17 @@ def insert(data, table, *, schema=None, method="upsert", insert_method="single",
 			columns_constraint = getColumns_constraint(upsert_constraint, table=table, schema=schema, connection=connection)
 			update_changed = [key for key in update_changed if key not in columns_constraint]
 
+		use_snapshot = (snapshot is not None) and (snapshot is not False)
+		if (use_snapshot):
+			snapshot = PyUtilities.common.ensure_dict(snapshot, "name", useForTrue={})
+			snapshot_name = snapshot.get("name", None) or f"{schema}.{table}"
+			snapshot_key = PyUtilities.common.ensure_container(snapshot.get("key", None) or getColumns_constraint(upsert_constraint, table=table, schema=schema, connection=connection))
+
+			frameList = [pandas.DataFrame(_data) for _data in formatData(data)]
+			snapshot_diff = PyUtilities.datasource.general.diffSnapshot(pandas.concat(frameList, ignore_index=True) if frameList else pandas.DataFrame(columns=snapshot_key),
+				snapshot_name, snapshot_key, columns=snapshot.get("columns", None), snapshot_folder=snapshot.get("folder", None))
+			data = pandas.concat((snapshot_diff["insert"], snapshot_diff["update"]), ignore_index=True)
+
 		if (preInsert):
 			for (i, _data) in enumerate(formatData(preInsert()), start=last_i + 1):
 				_recieved, _data_used = doInsert(_data, i, connection)
@@ -496,6 +518,17 @@ def insert(data, table, *, schema=None, method="upsert", insert_method="single",
 				recieved.extend(_recieved)
 				last_i = i
 
+		if (use_snapshot):
+			frame_delete = snapshot_diff["delete"]
+			if (snapshot.get("delete", False) and (not frame_delete.empty)):
+				logging.info(f"Will delete {len(frame_delete.index)} rows from '{schema}.{table}' that are no longer in the snapshot")
+				runSQL([[
+					f"""DELETE FROM {schema}.{table} WHERE ({', '.join(f'"{key}"' for key in snapshot_key)}) IN %s""",
+					(tuple(frame_delete.itertuples(index=False, name=None)),)
+				]], connection=connection)
+
+			PyUtilities.datasource.general.saveSnapshot(snapshot_name, snapshot_diff, snapshot_folder=snapshot.get("folder", None))
+
 		if (not len(data_used)):
 			logging.info(f"No data was inserted into '{schema}.{table}' after {last_i} runs")
 			return ((), ())
@@ -850,11 +883,9 @@ def apply_foreign(frame, table, column=None, *, schema=None, fk=None, sameName=N
 
 		method = method.split("select_")[1]
 
-		# Get existing matches
-		data_existing = raw(
-			query_sql=f"SELECT DISTINCT {', '.join(search_fk__db)} FROM {schema}.{table}",
-			as_dict=False, connection=connection
-		)
+		# Get existing matches for only the keys in this frame
+		selectList = tuple(f'"{key}"' for key in search_fk__db)
+		data_existing = yield_existing(selectList, getKeys(frame_foreign))
 
 		frame_existing = pandas.DataFrame(data_existing, columns=search_fk__user)
 
@@ -878,50 +909,33 @@ def apply_foreign(frame, table, column=None, *, schema=None, fk=None, sameName=N
 			nonlocal missingValue_id_catalogue
 
 			if (PyUtilities.common.inspect.ismethod(value) or PyUtilities.common.inspect.isfunction(value)):
-				def wrappedFunction(series):
-					return value(series=series, frame=frame, key=key)
-
-				#####################
-
-				return wrappedFunction
+				# User functions are given one row at a time
+				return [value(series=series, frame=frame, key=key) for (i, series) in _frame.iterrows()]
 
 			match (value):
 				case "__UNIQUE__":
-					def wrappedFunction(series):
-						nonlocal missingValue_id_catalogue, existing
-
-						_value = f"Unknown {missingValue_id_catalogue[key]}"
-						while existing.get(_value):
-							missingValue_id_catalogue[key] += 1
-							_value = f"Unknown {missingValue_id_catalogue[key]}"
-
-						existing[_value] = True
-						return _value
-
-					#####################
+					# Number 'Unknown' values upwards, skipping any that are already used
+					existing = set(_frame[key].to_list())
+					count = missingValue_id_catalogue.setdefault(key, 1)
 
-					existing = {key: True for key in _frame[key].to_list()}
-
-					if (key not in missingValue_id_catalogue):
-						missingValue_id_catalogue[key] = 1
-
-					return wrappedFunction
-
-			def wrappedFunction(series):
-				return value
+					valueList = []
+					while (len(valueList) < len(_frame.index)):
+						_value = f"Unknown {count}"
+						if (_value not in existing):
+							valueList.append(_value)
+						count += 1
 
-			#####################
+					missingValue_id_catalogue[key] = count
+					return valueList
 
-			return wrappedFunction
+			return [value] * len(_frame.index)
 
 		def apply_missing(_frame):
 			for (key, value) in missing.items():
 				if (key not in _frame.columns):
 					_frame[key] = None
 
-				_get_missingValue = get_missingValue(_frame, key, value)
-				for i, series in _frame.iterrows():
-					_frame.at[i, key] = _get_missingValue(series)
+				_frame[key] = get_missingValue(_frame, key, value)
 
 		def get_columnList():
 			return [key for key in getColumns_constraint(PyUtilities.common.requiredArg(upsert_constraint, f"Missing *upsert_constraint* for {schema}.{table}"), table=table, schema=schema, connection=connection) if (key in frame_foreign.columns)]
@@ -961,11 +975,18 @@ def apply_foreign(frame, table, column=None, *, schema=None, fk=None, sameName=N
 					frame_foreign[column].replace(catalogue_sameName, inplace=True)
 					frame[frame_foreign.columns] = frame[frame_foreign.columns].replace(catalogue_sameName)
 
-					for (index, row) in frame_combined.iterrows():
-						for _column in fkList__user:
-							logging.debug(f"Replace '{_column}' where '{column}' is equal to '{row[column]}' with '{row[_column]}'")
-							frame_foreign.loc[frame_foreign[column] == f"{row[column]}", _column] = f"{row[_column]}"
-							frame.loc[frame[column] == row[column], _column] = row[_column]
+					# Later rows win if a value shows up more than once
+					frame_combined = frame_combined.drop_duplicates(subset=column, keep="last")
+					for _column in fkList__user:
+						catalogue_fk = dict(zip(frame_combined[column], frame_combined[_column]))
+						logging.debug(PyUtilities.logger.debugging and f"Replace '{_column}' where '{column}' is in {catalogue_fk}")
+
+						mask = frame[column].isin([key for key in catalogue_fk.keys() if pandas.notna(key)])
+						frame.loc[mask, _column] = frame.loc[mask, column].map(catalogue_fk)
+
+						catalogue_fk = {f"{key}": f"{value}" for (key, value) in catalogue_fk.items()}
+						mask = frame_foreign[column].isin(catalogue_fk.keys())
+						frame_foreign.loc[mask, _column] = frame_foreign.loc[mask, column].map(catalogue_fk)
 
 		columnList = None
 		if (fk_missing):
@@ -1013,7 +1034,9 @@ def apply_foreign(frame, table, column=None, *, schema=None, fk=None, sameName=N
 		# with pandas.option_context("display.max_rows", None, "display.max_columns", None):
 		# 	print(frame_foreign)
 
-		insert(
+		# Have the new rows sent back so they do not need to be looked up again
+		needs_lookup = refresh_fk or (fk_missing and (not insert_fk))
+		recieved, _ = insert(
 			data=frame_foreign,
 			table=table,
 			method=method,
@@ -1021,23 +1044,15 @@ def apply_foreign(frame, table, column=None, *, schema=None, fk=None, sameName=N
 			insert_method=insert_method,
 			upsert_constraint=upsert_constraint,
 			reset_incrementer=reset_incrementer,
+			returning=get_selectList() if needs_lookup else None,
 			connection=connection,
 		)
 
-	def do_lookup():
-		nonlocal frame, fk_missing, insert_fk, fk_type, fkList__alias, fkList__user, search_fk__alias, refresh_fk
-
-		if ((not refresh_fk) and ((not fk_missing) or insert_fk)):
-			return
-
-		if (refresh_fk and (not fk_missing)):
-			# Remove the foreign key from the frame and re-insert it
-			frame.drop(fkList__alias, axis=1, inplace=True)
-
-		fk_type = fk_type or {}
-		if (isinstance(fk_type, str)):
-			fk_type = { key: fk_type for key in fkList__user }
+		if (needs_lookup):
+			catalogue_returned.update({tuple(args): key for (key, *args) in (tuple(row.values()) for row in recieved)})
 
+	def get_selectList():
+		# The foreign key must be first
 		catalogue_lookup = {}
 		catalogue_lookup.update(fkList__alias)
 		catalogue_lookup.update(search_fk__alias)
@@ -1058,15 +1073,45 @@ def apply_foreign(frame, table, column=None, *, schema=None, fk=None, sameName=N
 			if (not key__db.startswith('\"')):
 				catalogue_lookup[key__user] = f'\"{key__db}\"'
 
-		# Get a lookup table for what index corresponds to which fk pair
-		selectList = tuple(f'{key__db} as \"{key__user}\"' for (key__user, key__db) in catalogue_lookup.items())
+		return tuple(f'{key__db} as \"{key__user}\"' for (key__user, key__db) in catalogue_lookup.items())
+
+	def getKeys(_frame):
+		# The distinct search keys in *_frame*, skipping any with a null in them
+		return {index for index in zip(*(_frame[_key] for _key in search_fk__user)) if (not any(pandas.isna(value) for value in index))}
+
+	def yield_existing(selectList, keyList, chunk_size=10000):
+		# Anti-join against only the given keys, so the whole table is never read
+		keyList = list(keyList)
+		where = ", ".join(f'"{key}"' for key in search_fk__db)
+		for i in range(0, len(keyList), chunk_size):
+			for row in raw(
+				query_sql=f"SELECT {', '.join(selectList)} FROM {schema}.{table} WHERE ({where}) IN %s",
+				query_args=(tuple(keyList[i:i + chunk_size]),),
+				as_dict=False,
+				connection=connection,
+			):
+				yield row
 
-		existing_raw = raw(
-			query_sql=f"SELECT {', '.join(selectList)} FROM {schema}.{table}",
-			as_dict=False,
-			connection=connection,
-		)
-		catalogue_index = { tuple(args): key for (key, *args) in existing_raw } # TODO: Currently, this method assumes thre is only a single fk; Support composite keys
+	def do_lookup():
+		nonlocal frame, fk_missing, insert_fk, fk_type, fkList__alias, fkList__user, search_fk__alias, refresh_fk
+
+		if ((not refresh_fk) and ((not fk_missing) or insert_fk)):
+			return
+
+		if (refresh_fk and (not fk_missing)):
+			# Remove the foreign key from the frame and re-insert it
+			frame.drop(fkList__alias, axis=1, inplace=True)
+
+		fk_type = fk_type or {}
+		if (isinstance(fk_type, str)):
+			fk_type = { key: fk_type for key in fkList__user }
+
+		# Get a lookup table for what index corresponds to which fk pair
+		# Keys that were not sent back by the insert (such as ones that already existed) are looked up on their own
+		catalogue_index = dict(catalogue_returned) # TODO: Currently, this method assumes thre is only a single fk; Support composite keys
+		keyList_missing = [index for index in getKeys(frame) if (index not in catalogue_index)]
+		if (keyList_missing):
+			catalogue_index.update({tuple(args): key for (key, *args) in yield_existing(get_selectList(), keyList_missing)})
 
 		# TODO: Support different types using 'fk_type'
 		for key in fkList__user:
@@ -1112,6 +1157,7 @@ def apply_foreign(frame, table, column=None, *, schema=None, fk=None, sameName=N
 	search_fk__alias, search_fk__user, search_fk__db = parse__search_fk()
 	columnKeep__alias, columnKeep__user, columnKeep__db = parse__columnKeep()
 
+	catalogue_returned = {}
 	frame_foreign = copyFrame()
 	do_filter()
 	do_insert()
@@ -1202,5 +1248,72 @@ class TestCase(PyUtilities.testing.BaseCase):
 					method="upsert",
 				)
 
+	def test_Postgres_snapshotOnlySendsChanges(self):
+		import tempfile
+		import unittest.mock
+
+		with tempfile.TemporaryDirectory() as folder:
+			with (
+				unittest.mock.patch.object(sys.modules[__name__], "runSQL", return_value=()) as mock_runSQL,
+				unittest.mock.patch.object(sys.modules[__name__], "getColumns_constraint", return_value=("unit_id",)) as mock_getColumns_constraint,
+				unittest.mock.patch.object(PyUtilities.datasource.general, "frameSnapshot_folder", folder),
+			):
+				frame = pandas.DataFrame({"unit_id": [1, 2, 3], "name": ["a", "b", "c"]})
+				(_, data_used) = insert(frame, "unit", snapshot=True, connection=object(), log_table=False)
+				self.assertEqual(len(data_used), 3)
+				self.assertEqual(mock_getColumns_constraint.call_args.args, ("unit_pkey",))
+				self.assertTrue(os.path.exists(PyUtilities.datasource.general.getSnapshotPath("public.unit")))
+
+				mock_runSQL.reset_mock()
+				frame = pandas.DataFrame({"unit_id": [1, 2, 4], "name": ["a", "B", "d"]})
+				(_, data_used) = insert(frame, "unit", snapshot={"delete": True}, connection=object(), log_table=False)
+				self.assertEqual(sorted(row["unit_id"] for row in data_used), [2, 4])
+
+				queryList = [query for (args, _) in mock_runSQL.call_args_list for query in args[0] if query[0].startswith("DELETE")]
+				self.assertEqual(len(queryList), 1)
+				self.assertEqual(queryList[0][1], (((3,),),))
+
+				mock_runSQL.reset_mock()
+				(_, data_used) = insert(frame, "unit", snapshot=True, connection=object(), log_table=False)
+				self.assertEqual(len(data_used), 0)
+				mock_runSQL.assert_not_called()
+
+	def test_apply_foreign_onlyLooksUpMissingKeys(self):
+		import unittest.mock
+
+		def mock_insert(data, **kwargs):
+			# Only "b" is new; "a" already existed, so upsert does not send it back here
+			return ([{"sos_id": 2, "name": "b"}], ())
+
+		frame = pandas.DataFrame({"name": ["a", "b", "a", None], "lorem": [1, 2, 3, 4]})
+		with (
+			unittest.mock.patch.object(sys.modules[__name__], "insert", side_effect=mock_insert),
+			unittest.mock.patch.object(sys.modules[__name__], "raw", return_value=((1, "a"),)) as mock_raw,
+			unittest.mock.patch.object(sys.modules[__name__], "getColumns_constraint", return_value=("name",)),
+		):
+			apply_foreign(frame, table="sos", column="name", connection=object())
+
+		self.assertEqual(frame["sos_id"].tolist(), [1, 2, 1, 0])
+		self.assertNotIn("name", frame.columns)
+
+		self.assertEqual(mock_raw.call_count, 1)
+		self.assertIn("WHERE (\"name\") IN %s", mock_raw.call_args.kwargs["query_sql"])
+		self.assertEqual(mock_raw.call_args.kwargs["query_args"], ((("a",),),))
+
+	def test_apply_foreign_selectInsertsOnlyNewKeys(self):
+		import unittest.mock
+
+		frame = pandas.DataFrame({"name": ["a", "b", "a", "c"]})
+		with (
+			unittest.mock.patch.object(sys.modules[__name__], "insert", return_value=((), ())) as mock_insert,
+			unittest.mock.patch.object(sys.modules[__name__], "raw", return_value=(("a",),)) as mock_raw,
+			unittest.mock.patch.object(sys.modules[__name__], "getColumns_constraint", return_value=("name",)),
+		):
+			apply_foreign(frame, table="sos", column="name", method="select_insert_ignore", insert_fk=False, connection=object())
+
+		self.assertEqual(mock_insert.call_args_list[0].kwargs["data"]["name"].tolist(), ["b", "c"])
+		self.assertEqual(mock_insert.call_args_list[0].kwargs["method"], "insert_ignore")
+		self.assertEqual(sorted(mock_raw.call_args_list[0].kwargs["query_args"][0]), [("a",), ("b",), ("c",)])
+
 if (__name__ == "__main__"):
-	PyUtilities.testing.test()
\ No newline at end of file
+	PyUtilities.testing.test(TestCase)
\ No newline at end of file
@@ -1,24 +1,27 @@
 import io
 import os
 import sys
-import boto3
 import pandas
 import logging
 import datetime
 import requests
-import imagehash
 import mimetypes
 import contextlib
 import urllib.parse
 
-import PIL.Image
 import xml.etree.ElementTree
 
 import PyUtilities.common
+import PyUtilities.lazyLoad
+import PyUtilities.datasource.common
 import PyUtilities.datasource.general
 import PyUtilities.datasource.postgres
 from PyUtilities.datasource.common import config
 
+PIL = PyUtilities.lazyLoad.load("PIL.Image")
+boto3 = PyUtilities.lazyLoad.load("boto3")
+imagehash = PyUtilities.lazyLoad.load("imagehash")
+
 def lookup_typeId(url, mimeType=None):
 	""" Determines what type_id to use for the given attachment
 
@@ -112,17 +115,14 @@ def openURL(url, *, handle_bytes=None, handle_pil=None):
 	if (handle_bytes is not None):
 		return handle_bytes
 
-	if (isinstance(url, io.BytesIO)):
+	if (hasattr(url, "read")):
 		return url
 
 	if (isinstance(url, str)):
 		if (not url.startswith("http")):
 			raise NotImplementedError(f"Cannot find the file '{url}'")
 
-		response = requests.request("GET", url, stream=True, headers={}, data={})
-		handle_bytes = io.BytesIO(response.content)
-		handle_bytes.contentType = response.headers['content-type']
-		return handle_bytes
+		return PyUtilities.datasource.common.download(url)
 
 	if (isinstance(url, PIL.Image.Image)):
 		raise SyntaxError("Cannot derive *handle_bytes* from *handle_pil*")
@@ -142,7 +142,7 @@ def openPIL(url, *, handle_bytes=None, handle_pil=None):
 		return url
 
 	if (handle_bytes is None):
-		handle_bytes = url if (isinstance(url, io.BytesIO)) else openURL(url)
+		handle_bytes = url if hasattr(url, "read") else openURL(url)
 
 	try:
 		return PIL.Image.open(handle_bytes)
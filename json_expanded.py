@@ -1,12 +1,170 @@
+import re
 import json
+import math
+import numpy
 import pandas
+import decimal
 import datetime
+import functools
 import collections
 
+import PyUtilities.testing
+import PyUtilities.lazyLoad
+
+orjson = PyUtilities.lazyLoad.load("orjson")
+
 global__set_tag = "_set"
 global__timedelta_tag = "_timedelta"
 global__datetime_tag = "_datetime"
 global__datetime_method = "dict"
+global__backend = None
+global__decimal_marker = "\x00decimal\x00"
+
+# What a decimal looks like once its marker has been written as a json string; see: replaceDecimals()
+decimal_pattern = re.compile(r'"\\u0000decimal\\u0000([^"]*)"')
+
+def encodeSet(item):
+	return {global__set_tag: list(item)}
+
+def encodeDatetime(item):
+	if (global__datetime_method == "string"):
+		return item.strftime(r"%Y-%m-%dT%H:%M:%S")
+
+	return {
+		global__datetime_tag: {
+			'year' : item.year,
+			'month' : item.month,
+			'day' : item.day,
+			'hour' : item.hour,
+			'minute' : item.minute,
+			'second' : item.second,
+			'microsecond' : item.microsecond,
+		}
+	}
+
+def encodeTimedelta(item):
+	return {
+		global__timedelta_tag: {
+			'days' : item.days,
+			'seconds' : item.seconds,
+			'microseconds' : item.microseconds,
+		}
+	}
+
+def encodeNull(item):
+	return None
+
+def encodeDecimal(item):
+	# Marked so *replaceDecimals* can write it as a bare number, since going through float would lose digits
+	return f"{global__decimal_marker}{item}" if item.is_finite() else None
+
+def encodeNumpy(item):
+	return item.tolist()
+
+def encodeFloating(item):
+	return item.item() if numpy.isfinite(item) else None
+
+def encodeDatetime64(item):
+	return encodeDefault(pandas.Timestamp(item))
+
+def encodeTimedelta64(item):
+	return encodeDefault(pandas.Timedelta(item))
+
+# How to turn each type that json cannot handle on its own into something it can; see: encodeDefault()
+default_catalogue = {
+	set: encodeSet,
+	datetime.datetime: encodeDatetime,
+	datetime.timedelta: encodeTimedelta,
+	type(pandas.NaT): encodeNull,
+	type(pandas.NA): encodeNull,
+	pandas.Timestamp: encodeDatetime,
+	pandas.Timedelta: encodeTimedelta,
+	decimal.Decimal: encodeDecimal,
+	numpy.bool_: encodeNumpy,
+	numpy.integer: encodeNumpy,
+	numpy.floating: encodeFloating,
+	numpy.ndarray: encodeNumpy,
+	numpy.datetime64: encodeDatetime64,
+	numpy.timedelta64: encodeTimedelta64,
+}
+
+def encodeDefault(item):
+	""" Returns *item* as something json can handle, looking up how to do that by its type.
+	Subclasses use what their closest parent in *default_catalogue* uses, and that is remembered for next time.
+	Raises a TypeError for anything that cannot be converted, like *json.JSONEncoder.default* does.
+
+	Example Input: encodeDefault({1, 2, 3})
+	Example Input: encodeDefault(datetime.datetime.now())
+	"""
+
+	myFunction = default_catalogue.get(type(item), None)
+	if (myFunction is not None):
+		return myFunction(item)
+
+	for parent in type(item).__mro__[1:]:
+		myFunction = default_catalogue.get(parent, None)
+		if (myFunction is not None):
+			default_catalogue[type(item)] = myFunction
+			return myFunction(item)
+
+	try:
+		if (pandas.isnull(item)):
+			return None
+	except (TypeError, ValueError):
+		pass
+
+	raise TypeError(f"Object of type {type(item).__name__} is not JSON serializable")
+
+def replaceDecimals(text):
+	""" Returns *text* with each decimal *encodeDecimal* marked written as a json number that has all of its digits.
+	Both json and orjson escape the marker the same way, so this works for either.
+
+	Example Input: replaceDecimals(json.dumps(decimal.Decimal("0.10"), cls=_JSONEncoder))
+	"""
+
+	if ("\\u0000decimal" not in text):
+		return text
+
+	return decimal_pattern.sub(r"\1", text)
+
+def decodeHook(catalogue):
+	""" Turns a tagged dictionary back into the set, datetime or timedelta it was made from.
+
+	Example Input: decodeHook({"_set": [1, 2, 3]})
+	"""
+
+	if (global__set_tag in catalogue):
+		return set(catalogue[global__set_tag])
+
+	if (global__datetime_tag in catalogue):
+		return datetime.datetime(**catalogue[global__datetime_tag])
+
+	if (global__timedelta_tag in catalogue):
+		return datetime.timedelta(**catalogue[global__timedelta_tag])
+
+	return catalogue
+
+def decodeTags(item):
+	""" Applies *decodeHook* to every dictionary in *item*, from the inside out like *object_hook* does.
+	Only plain dictionaries and lists are looked into, since that is all a json parser makes.
+
+	Example Input: decodeTags(orjson.loads(text))
+	"""
+
+	if (type(item) is dict):
+		for (key, value) in item.items():
+			if (type(value) in containerTypes):
+				item[key] = decodeTags(value)
+		return decodeHook(item)
+
+	if (type(item) is list):
+		for (i, value) in enumerate(item):
+			if (type(value) in containerTypes):
+				item[i] = decodeTags(value)
+
+	return item
+
+containerTypes = frozenset((dict, list))
 
 #Expand JSON
 class _JSONEncoder(json.JSONEncoder):
@@ -22,38 +180,17 @@ class _JSONEncoder(json.JSONEncoder):
 	"""
 
 	def default(self, item):
-		if (pandas.isnull(item)):
-			return None
-				
-		if (isinstance(item, set)):
-			return {global__set_tag: list(item)}
-
-		if isinstance(item, datetime.datetime):
-			if (global__datetime_method == "string"):
-				return item.strftime(r"%Y-%m-%dT%H:%M:%S")
-
-			return {
-				global__datetime_tag: {
-					'year' : item.year,
-					'month' : item.month,
-					'day' : item.day,
-					'hour' : item.hour,
-					'minute' : item.minute,
-					'second' : item.second,
-					'microsecond' : item.microsecond,
-				}
-			}
-
-		if (isinstance(item, datetime.timedelta)):
-			return {
-				global__timedelta_tag: {
-					'days' : item.days,
-					'seconds' : item.seconds,
-					'microseconds' : item.microseconds,
-				}
-			}
-
-		return super().default(item)
+		return encodeDefault(item)
+
+	def encode(self, item):
+		return replaceDecimals(super().encode(item))
+
+	def iterencode(self, item, _one_shot=False):
+		if (_one_shot):
+			return super().iterencode(item, _one_shot)
+
+		# Each marked decimal is written in a single chunk
+		return map(replaceDecimals, super().iterencode(item, _one_shot))
 
 class _JSONDecoder(json.JSONDecoder):
 	"""Allows sets to be loaded from JSON files.
@@ -71,25 +208,150 @@ class _JSONDecoder(json.JSONDecoder):
 		super().__init__(object_hook = object_hook or self.myHook, **kwargs)
 
 	def myHook(self, catalogue):
-		if (global__set_tag in catalogue):
-			return set(catalogue[global__set_tag])
+		return decodeHook(catalogue)
+
+def dumps_orjson(item, *, sort_keys=False, indent=None, default=None):
+	""" Returns *item* as a json string using orjson, tagging sets, datetimes and timedeltas the same way *_JSONEncoder* does.
+	The data is the same as what *json.dumps* makes, but the text is compact, not ascii-escaped, and NaN is written as null.
+	Raises an orjson.JSONEncodeError for what orjson cannot write (like integers over 64 bits), so the caller can fall back to *json.dumps*.
+	See: https://github.com/ijl/orjson#serialize
+
+	Example Input: dumps_orjson({"lorem": {1, 2, 3}})
+	"""
 
-		if (global__datetime_tag in catalogue):
-			return datetime.datetime(**catalogue[global__datetime_tag])
+	return replaceDecimals(orjson.dumps(item, default=default or encodeDefault, option=getOrjsonOption(sort_keys, bool(indent))).decode())
 
-		if (global__timedelta_tag in catalogue):
-			return datetime.timedelta(**catalogue[global__timedelta_tag])
+@functools.cache
+def getOrjsonOption(sort_keys=False, indent=False):
+	""" Returns the orjson option flags to use, working them out only once.
 
-		return catalogue
+	Example Input: getOrjsonOption()
+	"""
+
+	# Datetimes are passed through so they get tagged like the json module does
+	option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+	if (sort_keys):
+		option |= orjson.OPT_SORT_KEYS
+	if (indent):
+		option |= orjson.OPT_INDENT_2
+
+	return option
 
-def makeDefault(set_tag=None, timedelta_tag=None, datetime_tag=None, datetime_method=None, **kwargs):
-	global global__set_tag, global__timedelta_tag, global__datetime_tag, global__datetime_method
+def loads_orjson(text):
+	""" Returns the python object for *text* using orjson, turning tagged dictionaries back into sets, datetimes and timedeltas.
+	Dictionaries are only walked when *text* has a tag in it at all.
+	Raises an orjson.JSONDecodeError for what orjson cannot read (like NaN), so the caller can fall back to *json.loads*.
+	See: https://github.com/ijl/orjson#deserialize
+
+	Example Input: loads_orjson('{"_set": [1, 2, 3]}')
+	"""
+
+	answer = orjson.loads(text)
+
+	tagList = {f'"{tag}"' for tag in (global__set_tag, global__timedelta_tag, global__datetime_tag)}
+	if (isinstance(text, (bytes, bytearray, memoryview))):
+		text = bytes(text)
+		tagList = {tag.encode() for tag in tagList}
+
+	if (any((tag in text) for tag in tagList)):
+		return decodeTags(answer)
+
+	return answer
+
+def replaceNan(item):
+	""" Returns a copy of *item* where every NaN or infinite float is None, since json has no way to write them.
+	Values json cannot handle on its own are converted with *encodeDefault* first, so the floats inside them are found too.
+
+	Example Input: replaceNan({"lorem": float("nan")})
+	"""
+
+	if (isinstance(item, float)):
+		return item if math.isfinite(item) else None
+
+	if (isinstance(item, (str, int)) or (item is None)):
+		return item
+
+	if (isinstance(item, dict)):
+		return {key: replaceNan(value) for (key, value) in item.items()}
+
+	if (isinstance(item, (list, tuple))):
+		return [replaceNan(value) for value in item]
+
+	return replaceNan(encodeDefault(item))
+
+def dumpsColumn(column, *, skip_str=True):
+	""" Returns a list of json strings, one for each value in *column*, using a single encoder for all of them.
+	Uses orjson if *makeDefault* was told to.
+	NaN and infinite floats are written as null with either backend, since postgres does not accept NaN in json.
+
+	column (list) - What to turn into json strings
+		- If pandas.Series: Its values are used
+	skip_str (bool) - If values that are already strings should be kept as they are, instead of being turned into a json string
+
+	Example Input: dumpsColumn([{"lorem": 1}, {"ipsum": numpy.int64(2)}])
+	Example Input: dumpsColumn(frame["lorem"])
+	"""
+
+	if (isinstance(column, pandas.Series)):
+		column = column.tolist()
+
+	def encode_json(item):
+		try:
+			return encoder.encode(item)
+		except ValueError:
+			# Only values with NaN in them need the slower walk
+			return encoder.encode(replaceNan(item))
+
+	def encode_orjson(item):
+		try:
+			return replaceDecimals(dumps(item, default=encodeDefault, option=option).decode())
+		except error:
+			return encode_json(item)
+
+	#################################
+
+	encoder = _JSONEncoder(allow_nan=False)
+	encode = encode_json
+
+	if (global__backend == "orjson"):
+		# Look these up once instead of for every value
+		dumps, option, error = orjson.dumps, getOrjsonOption(), orjson.JSONEncodeError
+		encode = encode_orjson
+
+	if (skip_str):
+		return [item if isinstance(item, str) else encode(item) for item in column]
+
+	return [encode(item) for item in column]
+
+def makeDefault(set_tag=None, timedelta_tag=None, datetime_tag=None, datetime_method=None, *, backend=None, **kwargs):
+	""" Makes *json.dump*, *json.dumps*, *json.load* and *json.loads* handle sets, datetimes and timedeltas for the whole process.
+
+	backend (str) - What does the work when no special arguments are given
+		- If None: Uses the json module with *_JSONEncoder* and *_JSONDecoder*
+		- orjson: Uses orjson, which is several times faster; falls back to the json module for arguments or values orjson does not support
+
+	Example Input: makeDefault()
+	Example Input: makeDefault(datetime_method="string", backend="orjson")
+	"""
+	global global__set_tag, global__timedelta_tag, global__datetime_tag, global__datetime_method, global__backend
 
 	global__set_tag = set_tag or ""
 	global__timedelta_tag = timedelta_tag or ""
 	global__datetime_tag = datetime_tag or ""
 	global__datetime_method = datetime_method or ""
 
+	match (backend):
+		case None:
+			use_orjson = False
+
+		case "orjson":
+			use_orjson = True
+			orjson.dumps # Raise an ImportError now if it is not installed
+
+		case _:
+			raise KeyError(f"Unknown *backend* '{backend}'")
+
+	global__backend = backend
 
 	json._default_encoder = _JSONEncoder(**kwargs)
 	json._default_decoder = _JSONDecoder(**kwargs)
@@ -98,6 +360,13 @@ def makeDefault(set_tag=None, timedelta_tag=None, datetime_tag=None, datetime_me
 	def mp_dump(*args, cls = None, **kwargs):
 		"""Defaults to *_JSONEncoder* when kwargs are given"""
 
+		if (use_orjson and (cls is None) and (len(args) == 2) and (kwargs.keys() <= {"sort_keys", "indent", "default"}) and (kwargs.get("indent", None) in (None, 2))):
+			try:
+				args[1].write(dumps_orjson(args[0], **kwargs))
+				return
+			except orjson.JSONEncodeError:
+				pass
+
 		if (cls is None):
 			cls = _JSONEncoder
 
@@ -108,6 +377,12 @@ def makeDefault(set_tag=None, timedelta_tag=None, datetime_tag=None, datetime_me
 	def mp_dumps(*args, cls = None, **kwargs):
 		"""Defaults to *_JSONEncoder* when kwargs are given"""
 
+		if (use_orjson and (cls is None) and (len(args) == 1) and (kwargs.keys() <= {"sort_keys", "indent", "default"}) and (kwargs.get("indent", None) in (None, 2))):
+			try:
+				return dumps_orjson(args[0], **kwargs)
+			except orjson.JSONEncodeError:
+				pass
+
 		if (cls is None):
 			cls = _JSONEncoder
 
@@ -118,6 +393,9 @@ def makeDefault(set_tag=None, timedelta_tag=None, datetime_tag=None, datetime_me
 	def mp_load(*args, cls = None, **kwargs):
 		"""Defaults to *_JSONDecoder* when kwargs are given"""
 
+		if (use_orjson and (cls is None) and (len(args) == 1) and (not kwargs)):
+			return mp_loads(args[0].read())
+
 		if (cls is None):
 			cls = _JSONDecoder
 
@@ -128,8 +406,98 @@ def makeDefault(set_tag=None, timedelta_tag=None, datetime_tag=None, datetime_me
 	def mp_loads(*args, cls = None, **kwargs):
 		"""Defaults to *_JSONDecoder* when kwargs are given"""
 
+		if (use_orjson and (cls is None) and (len(args) == 1) and (not kwargs)):
+			try:
+				return loads_orjson(args[0])
+			except orjson.JSONDecodeError:
+				pass
+
 		if (cls is None):
 			cls = _JSONDecoder
 
 		return original_loads(*args, cls = cls, **kwargs)
-	json.loads = mp_loads
\ No newline at end of file
+	json.loads = mp_loads
+
+def benchmark_backend(results=100, items=50, *, number=20, **kwargs):
+	""" Times the json module with *_JSONEncoder* / *_JSONDecoder* against orjson on a page of Formsite-like results.
+	Returns what *PyUtilities.benchmarking.benchmark* returns for dumping and for loading.
+
+	results (int) - How many results are on the page
+	items (int) - How many answers each result has
+
+	Example Input: benchmark_backend()
+	Example Input: benchmark_backend(results=500)
+	"""
+
+	import PyUtilities.benchmarking
+
+	now = datetime.datetime(2023, 1, 1, 12, 30, 15)
+	payload = {
+		"results": [{
+			"id": i,
+			"result_status": "Complete",
+			"date_start": now,
+			"date_finish": now + datetime.timedelta(minutes=5),
+			"user_ip": "127.0.0.1",
+			"user_browser": "Chrome",
+			"tags": {"lorem", "ipsum"},
+			"items": [{"id": str(j), "position": j, "value": f"Answer {j}", "values": [{"position": 0, "value": "Yes"}]} for j in range(items)],
+		} for i in range(results)],
+	}
+
+	text = json.dumps(payload, cls=_JSONEncoder)
+	text_untagged = json.dumps({"results": [{**result, "tags": list(result["tags"]), "date_finish": None} for result in payload["results"]]}, cls=_JSONEncoder)
+
+	answer = {}
+	answer["dumps"] = PyUtilities.benchmarking.benchmark({
+		"json": lambda: json.JSONEncoder.encode(_JSONEncoder(), payload),
+		"orjson": lambda: dumps_orjson(payload),
+	}, number=number, label="dumps", **kwargs)
+
+	answer["loads"] = PyUtilities.benchmarking.benchmark({
+		"json": lambda: _JSONDecoder().decode(text),
+		"orjson": lambda: loads_orjson(text),
+		"json (no tags)": lambda: _JSONDecoder().decode(text_untagged),
+		"orjson (no tags)": lambda: loads_orjson(text_untagged),
+	}, number=number, label="loads", **kwargs)
+
+	return answer
+
+class TestCase(PyUtilities.testing.BaseCase):
+	def test_dumpsColumn_writesNanAsNull(self):
+		import sys
+		import unittest.mock
+
+		column = [float("nan"), numpy.float64("nan"), numpy.float32("inf"), {"lorem": [1.5, float("-inf")]}, numpy.array([1.0, numpy.nan]), None]
+
+		for backend in (None, "orjson"):
+			with self.subTest(backend=backend):
+				with unittest.mock.patch.object(sys.modules[__name__], "global__backend", backend):
+					answer = dumpsColumn(column)
+
+				self.assertNotIn("NaN", "".join(answer))
+				self.assertNotIn("Infinity", "".join(answer))
+				self.assertEqual([json.loads(item) for item in answer], [None, None, None, {"lorem": [1.5, None]}, [1.0, None], None])
+
+	def test_dumpsColumn_keepsDecimalDigits(self):
+		import sys
+		import unittest.mock
+
+		column = [decimal.Decimal("12345678901234567.123456789"), {"lorem": decimal.Decimal("0.10")}, [decimal.Decimal("-1E+3"), float("nan")], decimal.Decimal("NaN"), decimal.Decimal("Infinity")]
+
+		for backend in (None, "orjson"):
+			with self.subTest(backend=backend):
+				with unittest.mock.patch.object(sys.modules[__name__], "global__backend", backend):
+					answer = dumpsColumn(column)
+
+				self.assertEqual(answer, ["12345678901234567.123456789", '{"lorem":0.10}' if backend else '{"lorem": 0.10}', "[-1E+3,null]" if backend else "[-1E+3, null]", "null", "null"])
+				self.assertEqual(json.loads(answer[0], parse_float=decimal.Decimal), decimal.Decimal("12345678901234567.123456789"))
+
+		# Writing to a file goes through *iterencode* instead of *encode*
+		import io
+		handle = io.StringIO()
+		json.dump(column[:3], handle, cls=_JSONEncoder, indent=1)
+		self.assertEqual(json.loads(handle.getvalue(), parse_float=decimal.Decimal)[1], {"lorem": decimal.Decimal("0.10")})
+
+if (__name__ == "__main__"):
+	PyUtilities.testing.test(TestCase)
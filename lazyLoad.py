@@ -1,179 +1,177 @@
-raise NotImplementedError()
-
-# import os
-
-# lockPath = "lazyLoad_disabled.lock"
-# if (os.path.exists(lockPath)):
-# 	import importlib
-# else:
-# 	import lazy_import
-
-# #Required Modules
-# ##py -m pip install
-# 	# lazy_import
-
-# #Some lazy imports are turned off for now, because of: https://github.com/mnmelo/lazy_import/issues/10
-
-# _loadCatalogue = {
-# 	"wx": (
-# 		# "wx.adv", 
-# 		# "wx.grid", 
-# 		# "wx.html", 
-
-# 		# "wx.lib.masked", 
-# 		# "wx.lib.buttons", 
-# 		# "wx.lib.dialogs", 
-# 		# "wx.lib.newevent", 
-# 		# "wx.lib.wordwrap", 
-# 		# "wx.lib.splitter", 
-# 		# "wx.lib.scrolledpanel", 
-# 		# "wx.lib.mixins.listctrl", 
-
-# 		# "wx.lib.agw.aui", 
-# 		# "wx.lib.agw.flatmenu", 
-# 		# "wx.lib.agw.floatspin", 
-# 		# "wx.lib.agw.multidirdialog", 
-# 		# "wx.lib.agw.fourwaysplitter", 
-# 		# "wx.lib.agw.ultimatelistctrl", 
-# 		# "wx.lib.agw.genericmessagedialog", 
-# 	),
-
-# 	"sqlalchemy": (
-# 		"sqlalchemy_utils",
-# 	),
-
-# 	"serial": (
-# 		"serial.tools.list_ports",
-# 	),
-
-# 	"email": (
-# 		"email.encoders",
-# 		"email.mime.base.MIMEBase",
-# 		"email.mime.text.MIMEText",
-# 		"email.mime.image.MIMEImage",
-# 		"email.mime.multipart.MIMEMultipart",
-# 	),
-
-# 	"xml": (
-# 		"xml.etree.cElementTree",
-# 	),
-
-# 	"ctypes": (
-# 		"ctypes.windll",
-# 	),
-
-# 	"distutils": (
-# 		"distutils.core.setup",
-# 	),
-
-# 	"Cryptodome": (
-# 		"Cryptodome.Random", 
-# 		"Cryptodome.Cipher.AES", 
-# 		"Cryptodome.PublicKey.RSA", 
-# 		"Cryptodome.Cipher.PKCS1_OAEP", 
-# 	),
-
-# 	"matplotlib": (
-# 		"matplotlib.pyplot", 
-# 	),
-
-# 	"Utilities": (
-# 		"Utilities.legal", 
-# 		"Utilities.logger", 
-# 		"Utilities.common", 
-# 		"Utilities.caching", 
-# 		"Utilities.wxPython", 
-# 		"Utilities.debugging", 
-# 		"Utilities.subProcess", 
-# 		"Utilities.multiProcess", 
-# 		"Utilities.threadManager", 
-# 	),
-
-# 	# "forks": (
-# 	# 	{"name": "forks.pypubsub.src.pubsub.pub", "autoBase": False}
-# 	# ),
-# }
-
-# _typical = (
-# 	"re", "time", "math", "types", 
-# 	"abc", "enum", "shutil", "decimal", "datetime", 
-# 	"queue", "threading", "subprocess", 
-# 	"typing", "inspect", "warnings", "traceback", 
-# 	"operator", "itertools", "functools", "contextlib", "collections", 
-# )
-
-# def disable():
-# 	"""Turns off lazy loading.
-
-# 	Example Input: disable()
-# 	"""
-# 	global lockPath
-
-# 	if (not os.path.exists(lockPath)):
-# 		with open(lockPath):
-# 			pass
-
-# def enable():
-# 	"""Turns on lazy loading.
-
-# 	Example Input: enable()
-# 	"""
-# 	global lockPath
-
-# 	if (os.path.exists(lockPath)):
-# 		os.remove(lockPath)
-
-# def load(name = None, *moreNames, autoBase = True, useCatalogue = True, includeKey = True):
-# 	"""Lazy loads the given module.
-
-# 	name (str) - What module to lazy load
-# 		- If None: Will load the list from '_typical'
-# 		- If list: Will load all modules given in the list
-
-# 	autoBase (bool) - Determines if the base is used instead of leaf for the import level
-# 	useCatalogue (bool) - Determines if '_loadCatalogue' is consulted for extra imports
-# 	includeKey (bool) - Determines if 'name' is included when using the catalogue
-
-# 	Example Input: load("numpy")
-# 	Example Input: load("numpy", "wx")
-# 	Example Input: load(("numpy", "wx"))
-# 	"""
-# 	global _typical, _loadCatalogue, lockPath
-
-# 	if (os.path.exists(lockPath)):
-# 		def applyImport(_name):
-# 			if (os.path.isfile(_name)):
-# 				sys.path.append(os.path.dirname(_name))
-# 				return importlib.import_module(os.path.splitext(os.path.basename(_name))[0])
-# 			else:
-# 				return importlib.import_module(_name)
-# 	else:
-# 		def applyImport(_name):
-# 			return lazy_import.lazy_module(_name, level = ("leaf", "base")[autoBase])
-
-# 	def yieldModules():
-# 		if (includeKey):
-# 			yield applyImport(name)
-
-# 		for item in load(_loadCatalogue[name], autoBase = autoBase, useCatalogue = useCatalogue):
-# 			yield item
-
-# 	#####################
-	
-# 	if (name is None):
-# 		name = _typical
-
-# 	if (moreNames):
-# 		return load((name, *moreNames), autoBase = autoBase, useCatalogue = useCatalogue)
-
-# 	if (not isinstance(name, str)):
-# 		if (isinstance(name, dict)):
-# 			return load(**name, autoBase = autoBase, useCatalogue = useCatalogue)
-# 		return tuple(load(item, autoBase = autoBase, useCatalogue = useCatalogue) for item in name)
-
-# 	if (useCatalogue and (name in _loadCatalogue)):
-# 		return tuple(yieldModules())
-
-# 	return applyImport(name)
-
-# load("Utilities")
+import os
+import sys
+import types
+import importlib
+
+lockPath = "lazyLoad_disabled.lock"
+
+# Extra modules to load along with a key; see: load()
+_loadCatalogue = {
+	"xml": (
+		"xml.etree.ElementTree",
+	),
+
+	"email": (
+		"email.encoders",
+		"email.mime.base",
+		"email.mime.text",
+		"email.mime.image",
+		"email.mime.multipart",
+	),
+}
+
+_typical = (
+	"re", "time", "math", "types",
+	"abc", "enum", "shutil", "decimal", "datetime",
+	"queue", "threading", "subprocess",
+	"typing", "inspect", "warnings", "traceback",
+	"operator", "itertools", "functools", "contextlib", "collections",
+)
+
+_lazyCatalogue = {}
+
+class LazyModule(types.ModuleType):
+	""" Stands in for a module until one of its attributes is first used, and only then imports it.
+	Modules are not put in *sys.modules* until they are really imported, so normal imports elsewhere are not affected.
+
+	Example Use: dropbox = LazyModule("dropbox")
+	Example Use: webflowpy = LazyModule("webflowpy", moduleList=("webflowpy.Webflow",))
+	"""
+
+	def __init__(self, name, *, moduleList=None):
+		"""
+		name (str) - Which module this stands in for
+		moduleList (list) - Which submodules to also import when *name* is imported
+		"""
+
+		super().__init__(name)
+		self._lazyLoad_moduleList = [name, *(moduleList or ())]
+		self._lazyLoad_module = None
+
+	def _lazyLoad_import(self):
+		module = self._lazyLoad_module
+		if (module is None):
+			for name in self._lazyLoad_moduleList:
+				importlib.import_module(name)
+
+			module = self._lazyLoad_module = sys.modules[self.__name__]
+
+		return module
+
+	def _lazyLoad_add(self, name):
+		""" Also imports *name* when this module is imported. """
+
+		if (self._lazyLoad_module is not None):
+			importlib.import_module(name)
+		elif (name not in self._lazyLoad_moduleList):
+			self._lazyLoad_moduleList.append(name)
+
+	def __getattr__(self, key):
+		if (key.startswith("_lazyLoad_")):
+			raise AttributeError(key)
+
+		return getattr(self._lazyLoad_import(), key)
+
+	def __dir__(self):
+		return dir(self._lazyLoad_import())
+
+	def __repr__(self):
+		if (self._lazyLoad_module is None):
+			return f"<lazy module '{self.__name__}' (not loaded)>"
+		return repr(self._lazyLoad_module)
+
+def is_loaded(module):
+	""" Returns if *module* has been imported yet.
+
+	Example Input: is_loaded(dropbox)
+	"""
+
+	if (isinstance(module, LazyModule)):
+		return module._lazyLoad_module is not None
+
+	return isinstance(module, types.ModuleType)
+
+def disable():
+	"""Turns off lazy loading.
+
+	Example Input: disable()
+	"""
+	global lockPath
+
+	if (not os.path.exists(lockPath)):
+		with open(lockPath, "w"):
+			pass
+
+def enable():
+	"""Turns on lazy loading.
+
+	Example Input: enable()
+	"""
+	global lockPath
+
+	if (os.path.exists(lockPath)):
+		os.remove(lockPath)
+
+def load(name = None, *moreNames, autoBase = True, useCatalogue = True, includeKey = True):
+	"""Lazy loads the given module.
+	The module is imported the first time one of its attributes is used.
+	Modules that are already imported are returned as they are.
+
+	name (str) - What module to lazy load
+		- If None: Will load the list from '_typical'
+		- If list: Will load all modules given in the list
+
+	autoBase (bool) - Determines if the base is used instead of leaf for the import level
+	useCatalogue (bool) - Determines if '_loadCatalogue' is consulted for extra imports
+	includeKey (bool) - Determines if 'name' is included when using the catalogue
+
+	Example Input: load("numpy")
+	Example Input: load("numpy", "wx")
+	Example Input: load(("numpy", "wx"))
+	Example Input: load("webflowpy.Webflow")
+	"""
+	global _typical, _loadCatalogue, _lazyCatalogue, lockPath
+
+	def applyImport(_name):
+		base = _name.split(".")[0] if autoBase else _name
+
+		if (os.path.exists(lockPath)):
+			importlib.import_module(_name)
+			return sys.modules[base]
+
+		if ((_name in sys.modules) and (base in sys.modules)):
+			return sys.modules[base]
+
+		if (base not in _lazyCatalogue):
+			_lazyCatalogue[base] = LazyModule(base)
+
+		module = _lazyCatalogue[base]
+		if (_name != base):
+			module._lazyLoad_add(_name)
+
+		return module
+
+	def yieldModules():
+		if (includeKey):
+			yield applyImport(name)
+
+		for item in load(_loadCatalogue[name], autoBase = autoBase, useCatalogue = useCatalogue):
+			yield item
+
+	#####################
+
+	if (name is None):
+		name = _typical
+
+	if (moreNames):
+		return load((name, *moreNames), autoBase = autoBase, useCatalogue = useCatalogue)
+
+	if (not isinstance(name, str)):
+		if (isinstance(name, dict)):
+			return load(**name, autoBase = autoBase, useCatalogue = useCatalogue)
+		return tuple(load(item, autoBase = autoBase, useCatalogue = useCatalogue) for item in name)
+
+	if (useCatalogue and (name in _loadCatalogue)):
+		return tuple(yieldModules())
+
+	return applyImport(name)
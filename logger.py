@@ -1,8 +1,14 @@
+import os
+import json
 import time
 import logging
+import datetime
 import collections
 
 import PyUtilities.common
+import PyUtilities.lazyLoad
+
+psutil = PyUtilities.lazyLoad.load("psutil")
 
 debugging = False
 logger = logging.getLogger(__name__)
@@ -146,3 +152,158 @@ def logger_runtime(log_open, log_save):
 			return answer
 		return wrapper
 	return decorator
+
+class StageProfiler():
+	""" Records how much each stage of a pipeline costs for each input it runs on.
+	Call *start()* when a new input begins, then *mark()* after each stage that ran.
+
+	EXAMPLE USE
+		profiler = StageProfiler("acapdetail")
+		for destination in yieldInputs():
+			profiler.start(destination)
+			frame = parse(destination)
+			profiler.mark("parse", frame)
+			frame = lorem(frame)
+			profiler.mark("lorem", frame)
+		profiler.log()
+	"""
+
+	def __init__(self, label=None, *, enabled=True):
+		"""
+		label (str) - What this run is called
+		enabled (bool) - If anything should be recorded; a disabled profiler does nothing when its methods are called
+		"""
+
+		self.label = label
+		self.enabled = enabled
+		self.records = []
+		self.timestamp = datetime.datetime.now()
+
+		self._item = None
+		self._last = None
+		self._process = psutil.Process(os.getpid()) if enabled else None
+
+	def __bool__(self):
+		return self.enabled
+
+	def _snapshot(self, frame):
+		return (time.perf_counter(), time.process_time(), self._process.memory_info().rss, None if (frame is None) else len(frame))
+
+	def start(self, item=None, frame=None):
+		""" Starts timing a new input.
+
+		item (str) - What the input is called
+		frame (any) - What the input is at the start, if anything yet
+
+		Example Input: start("lorem.csv")
+		Example Input: start("lorem.csv", frame)
+		"""
+
+		if (not self.enabled):
+			return
+
+		self._item = item
+		self._last = self._snapshot(frame)
+
+	def wrap(self, iterable):
+		""" Yields from *iterable*, calling *start()* before each item is fetched.
+		Use this when getting each input is part of the work, such as a generator that reads files.
+
+		Example Input: wrap(yieldInputs())
+		"""
+
+		if (not self.enabled):
+			yield from iterable
+			return
+
+		iterator = iter(iterable)
+		while True:
+			self.start()
+			try:
+				item = next(iterator)
+			except StopIteration:
+				return
+
+			yield item
+
+	def mark(self, stage, frame=None, *, item=None):
+		""" Records the cost of *stage* as everything since the last *start()* or *mark()*.
+
+		item (str) - What the current input is called; replaces what was given to *start()*
+
+		Example Input: mark("alias", frame)
+		Example Input: mark("parse", frame, item="lorem.csv")
+		"""
+
+		if (not self.enabled):
+			return
+
+		if (item is not None):
+			self._item = item
+
+		current = self._snapshot(frame)
+		if (self._last is None):
+			self._last = current
+			return
+
+		wall, cpu, memory, rows = self._last
+		self.records.append({
+			"item": self._item,
+			"stage": stage,
+			"wall": current[0] - wall,
+			"cpu": current[1] - cpu,
+			"rows_in": rows,
+			"rows_out": current[3],
+			"memory_delta": current[2] - memory,
+		})
+
+		# Do not count the bookkeeping above as part of the next stage
+		self._last = (time.perf_counter(), time.process_time(), current[2], current[3])
+
+	def summary(self):
+		""" Returns a list of the combined cost of each stage across all inputs, from most to least expensive.
+
+		Example Input: summary()
+		"""
+
+		catalogue = {}
+		for record in self.records:
+			total = catalogue.setdefault(record["stage"], {"stage": record["stage"], "count": 0, "wall": 0, "cpu": 0, "rows_in": 0, "rows_out": 0, "memory_delta": 0})
+			total["count"] += 1
+			for key in ("wall", "cpu", "rows_in", "rows_out", "memory_delta"):
+				total[key] += record[key] or 0
+
+		return sorted(catalogue.values(), key=lambda total: total["wall"], reverse=True)
+
+	def format_summary(self):
+		""" Returns *summary()* as a text table.
+
+		Example Input: format_summary()
+		"""
+
+		lines = [f"{'stage':<20} {'count':>6} {'wall (s)':>10} {'cpu (s)':>10} {'rows in':>10} {'rows out':>10} {'memory (MB)':>12}"]
+		for total in self.summary():
+			lines.append(f"{total['stage']:<20} {total['count']:>6} {total['wall']:>10.4f} {total['cpu']:>10.4f} {total['rows_in']:>10} {total['rows_out']:>10} {total['memory_delta'] / 1024 ** 2:>12.2f}")
+
+		return "\n".join(lines)
+
+	def log(self):
+		""" Logs the summary table at the info level.
+
+		Example Input: log()
+		"""
+
+		if (self.enabled and self.records):
+			logging.info(f"Stage profile{f' for {self.label}' if self.label else ''}:\n{self.format_summary()}")
+
+	def save(self, filepath):
+		""" Appends one JSON line describing this run to *filepath*.
+
+		Example Input: save("profile.jsonl")
+		"""
+
+		if (not self.enabled):
+			return
+
+		with open(filepath, "a") as handle:
+			handle.write(json.dumps({"label": self.label, "timestamp": self.timestamp.isoformat(), "records": self.records}, cls=json.JSONEncoder) + "\n")